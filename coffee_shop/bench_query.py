@@ -0,0 +1,55 @@
+"""
+Benchmark the batch query engine against calling the methods one by one.
+Run with: python bench_query.py
+"""
+
+# Import random to generate a reproducible order history
+import random
+# Import timeit to measure both approaches
+import timeit
+
+# Import the query engine and the classes needed to build a shop
+from query import METRICS, run_queries
+from shop import Shop
+
+
+def build_shop(num_customers=500, num_coffees=30, num_orders=50000, seed=1):
+    """Create a Shop with a random but reproducible order history."""
+    rng = random.Random(seed)
+    shop = Shop("Benchmark")
+    customers = [shop.add_customer(f"Customer {i}") for i in range(num_customers)]
+    coffees = [shop.add_coffee(f"Coffee {i}") for i in range(num_coffees)]
+    for _ in range(num_orders):
+        shop.create_order(rng.choice(customers), rng.choice(coffees),
+                          price_cents=rng.randint(100, 1000))
+    return shop
+
+
+def per_method(shop):
+    """Answer every metric for every coffee with the individual methods."""
+    for coffee in shop.coffees():
+        coffee.num_orders()
+        coffee.total_price_cents()
+        coffee.average_price()
+        shop.most_aficionado(coffee)
+        len(coffee.customers())
+
+
+def main():
+    """Time both approaches and print the results."""
+    shop = build_shop()
+    print(f"=== Batch query benchmark: {len(shop.orders())} orders, "
+          f"{len(shop.coffees())} coffees ===\n")
+    runs = 10
+    # Time the method-by-method approach
+    methods_time = min(timeit.repeat(lambda: per_method(shop), number=1, repeat=runs))
+    # Time the single-pass batch query
+    batch_time = min(timeit.repeat(lambda: run_queries(METRICS, shop), number=1, repeat=runs))
+    print(f"   - Individual methods: {methods_time * 1000:.1f} ms")
+    print(f"   - run_queries:        {batch_time * 1000:.1f} ms")
+    print(f"   - Speedup:            {methods_time / batch_time:.2f}x")
+
+
+# Python convention: execute main only if this file is run directly
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,12 @@
+# Import array for compact integer storage of prices
+from array import array
+
+# Import the HyperLogLog sketch used for approximate distinct-customer counts
+from hll import DistinctEstimate, HyperLogLog
+# Import the spend accumulator shared with Customer
+from order import SpendTotal
+
+
 class Coffee:
     """
     Coffee class represents a type of coffee available in the coffee shop.
@@ -5,17 +14,31 @@ class Coffee:
     Attributes:
         name (str): The name of the coffee.
         _orders (list): A list to store orders for this coffee.
+        _customer_sketch (HyperLogLog | None): Optional distinct-customer sketch.
+        _shop (Shop | None): The shop whose menu this coffee is on, if any.
+        _rollups (dict): Compacted orders, keyed by (period_start, customer).
     """
     
-    def __init__(self, name):
+    def __init__(self, name, shop=None):
         """
         Initialize a Coffee with a name.
         Name should be a string at least 3 characters long.
+        Coffees created with a shop (see Shop.add_coffee) are registered on
+        its menu and can only be ordered by customers of that shop.
         """
         # Set name using the property setter to validate the input
         self.name = name
         # Initialize an empty list to store all orders for this coffee
         self._orders = []
+        # Distinct-customer sketch, only created by track_distinct_customers()
+        self._customer_sketch = None
+        # Remember the owning shop (None means the process-wide registry)
+        self._shop = shop
+        # Rollups of compacted historical orders (see rollup.compact_orders)
+        self._rollups = {}
+        # Register with the shop last, once the coffee is fully built
+        if shop is not None:
+            shop._register_coffee(self)
     
     @property
     def name(self):
@@ -39,35 +62,148 @@ class Coffee:
         """Add an order to this coffee's orders list. (Internal method)"""
         # Append the order to this coffee's list (called by customer.create_order)
         self._orders.append(order)
+        # Count the customer in the distinct-customer sketch when enabled
+        if self._customer_sketch is not None:
+            self._customer_sketch.add(order.customer.name)
+
+    def _orders_and_rollups(self):
+        """
+        Return this coffee's raw orders and rollups as one consistent pair. (Internal method)
+
+        Shop.compact swaps both under the shop lock, so they are read under
+        it too. Coffees without a shop read them directly; compacting the
+        global registry must not run concurrently with these reads.
+        """
+        lock = getattr(self._shop, '_lock', None)
+        if lock is None:
+            return self._orders, self._rollups
+        with lock:
+            return self._orders, self._rollups
 
     def orders(self):
-        """Return a copy of the list of orders for this coffee."""
+        """Return a copy of the list of (not compacted) orders for this coffee."""
         # Return a copy to prevent external modification of the internal list
         return self._orders.copy()
 
     def customers(self):
         """Return a list of unique Customer instances who have ordered this coffee."""
+        # Read the raw orders and rollups together
+        orders, rollups = self._orders_and_rollups()
         # Create an empty set to store unique customer objects
         customers_set = set()
         # Iterate through all orders for this coffee
-        for order in self._orders:
+        for order in orders:
             # Add each customer from the order to the set (duplicates automatically ignored)
             customers_set.add(order.customer)
+        # Add the customers of compacted orders as well
+        customers_set.update(customer for _, customer in rollups)
         # Convert the set back to a list and return
         return list(customers_set)
 
     def num_orders(self):
         """Return the total number of times this coffee has been ordered."""
-        # Simply return the count of orders in the list
-        return len(self._orders)
+        # Count the raw orders plus the orders folded into rollups
+        orders, rollups = self._orders_and_rollups()
+        return len(orders) + sum(rollup.count for rollup in rollups.values())
 
     def average_price(self):
         """Return the average price for this coffee based on its orders."""
+        # Count every order, including compacted ones, from a single read
+        orders, rollups = self._orders_and_rollups()
+        count = len(orders) + sum(rollup.count for rollup in rollups.values())
         # Check if there are no orders for this coffee
-        if not self._orders:
+        if not count:
             # Return 0.0 if no orders exist (avoid division by zero)
             return 0.0
-        # Calculate the total of all order prices using sum()
-        total = sum(order.price for order in self._orders)
+        # Calculate the total of the rollup spend (oldest orders) and all raw order prices
+        total = sum(rollup.spend for rollup in rollups.values())
+        total += sum(order.price for order in orders)
         # Divide total by the number of orders to get average and return
-        return total / len(self._orders)
+        return total / count
+
+    def total_price_cents(self) -> int:
+        """
+        Return the total spent on this coffee, in integer cents.
+
+        The total is exact when every order was priced with price_cents;
+        otherwise it is the float total rounded to the nearest cent.
+        """
+        return self._spend_total().total_cents()
+
+    def average_price_cents(self) -> float:
+        """Return the average price for this coffee in cents, from total_price_cents()."""
+        # Count and total come from the same read of orders and rollups
+        total = self._spend_total()
+        # Check if there are no orders for this coffee
+        if not total.count:
+            return 0.0
+        # Only the final division is done in floating point
+        return total.total_cents() / total.count
+
+    def _spend_total(self):
+        """Return a SpendTotal of all orders of this coffee. (Internal method)"""
+        orders, rollups = self._orders_and_rollups()
+        total = SpendTotal()
+        for rollup in rollups.values():
+            total.add_rollup(rollup)
+        for order in orders:
+            total.add_order(order)
+        return total
+
+    def price_cents_array(self) -> array:
+        """
+        Return the prices of this coffee's raw (not compacted) orders as an
+        array of unsigned shorts.
+
+        Prices are at most 1000 cents, so two bytes per order are enough and
+        the array can be handed to vectorized code (e.g. numpy.frombuffer).
+        """
+        # Typecode 'H' is an unsigned 16-bit integer
+        return array('H', (order.price_cents for order in self._orders))
+
+    def track_distinct_customers(self, precision: int = 12) -> None:
+        """
+        Enable a HyperLogLog sketch of the customers who ordered this coffee.
+
+        The sketch uses 2 ** precision bytes (4 KB by default) no matter how
+        many orders arrive, and is backfilled from the existing orders and rollups.
+        Customers are identified by name (as in federation.AggregateState),
+        which is stable across processes and runs, so serialized sketches from
+        different stores or periods can be merged. Distinct Customer objects
+        sharing a name count once, unlike customers().
+        """
+        # Build the sketch and count the customers of existing orders
+        orders, rollups = self._orders_and_rollups()
+        sketch = HyperLogLog(precision)
+        sketch.update(order.customer.name for order in orders)
+        # Include the customers of orders already compacted into rollups
+        sketch.update(customer.name for _, customer in rollups)
+        self._customer_sketch = sketch
+
+    def distinct_sketch(self):
+        """Return a copy of the distinct-customer sketch, or None if not tracked."""
+        # Return a copy so merging across coffees cannot modify this coffee's sketch
+        if self._customer_sketch is None:
+            return None
+        return self._customer_sketch.copy()
+
+    def distinct_customers_estimate(self) -> DistinctEstimate:
+        """
+        Return the number of distinct customers who ordered this coffee.
+
+        With a sketch enabled the result is approximate: relative_error is the
+        relative standard error 1.04 / sqrt(2 ** precision), and low/high give
+        a ~95% interval. Without a sketch the count is exact (error 0.0).
+        Either way customers are identified by name, like the sketch, so
+        distinct Customer objects sharing a name count once (customers()
+        would list them separately).
+        """
+        # Use the sketch when tracking is enabled
+        if self._customer_sketch is not None:
+            return self._customer_sketch.estimate()
+        # Otherwise fall back to an exact count of the customer names
+        orders, rollups = self._orders_and_rollups()
+        names = {order.customer.name for order in orders}
+        names.update(customer.name for _, customer in rollups)
+        count = len(names)
+        return DistinctEstimate(count, 0.0, count, count)
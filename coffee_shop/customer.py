@@ -1,14 +1,39 @@
 # Enable forward references for type hints
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
 # Import Order class to create new orders
-from order import Order
+from order import Order, SpendTotal, top_spender
 
 # Use TYPE_CHECKING to avoid circular imports at runtime
 # Coffee is only imported for type hinting, not actual execution
 if TYPE_CHECKING:
     from coffee import Coffee
+    from events import OrderEventStream
+    from shop import Shop
+
+class SpendProfile(NamedTuple):
+    """
+    Running statistics of a customer's orders, returned by Customer.spend_profile().
+
+    Attributes:
+        order_count (int): Number of orders placed.
+        total_spend_cents (int): Total spent, in cents (exact if every order
+            was cents-priced, otherwise the float total rounded to cents).
+        total_spend (float): Total spent, as a float.
+        average_ticket (float): Average order price (0.0 without orders).
+        favourite_coffee (Coffee | None): Most ordered coffee; on a tie, the
+            coffee that reached the count first.
+        favourite_count (int): Number of orders of the favourite coffee.
+    """
+
+    order_count: int
+    total_spend_cents: int
+    total_spend: float
+    average_ticket: float
+    favourite_coffee: Coffee | None
+    favourite_count: int
+
 
 class Customer:
     """
@@ -17,23 +42,46 @@ class Customer:
     Attributes:
         name (str): The name of the customer.
         _orders (list): A list to store orders made by this customer.
+        _shop (Shop | None): The shop this customer belongs to, if any.
+        _rollups (dict): Compacted orders, keyed by (period_start, coffee).
     
     Class Attributes:
-        _all_orders (list): List of all orders made by all customers.
+        _all_orders (list): List of all orders made by customers without a shop.
+        _all_rollups (dict): Rollups compacted from _all_orders, keyed by
+            (period_start, customer, coffee).
+        _event_stream (OrderEventStream | None): Stream notified of every new order.
     """
 
     # Class variable to track all orders across all customers (for most_aficionado method)
     _all_orders = []
+    # Class variable holding the rollups of compacted orders (see rollup.compact_orders)
+    _all_rollups = {}
+    # Class variable holding the stream that receives order-created events (None = disabled)
+    _event_stream = None
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, shop: Shop | None = None):
         """
         Initialize a Customer with a name.
         Name should be a string between 1 and 15 characters.
+        Customers created with a shop (see Shop.add_customer) are registered
+        in it and record their orders in that shop instead of Customer._all_orders.
         """
         # Set name using the property setter to validate the input
         self.name = name
         # Initialize empty list to store this customer's orders
         self._orders = []
+        # Remember the owning shop (None means the process-wide registry)
+        self._shop = shop
+        # Rollups of compacted historical orders (see rollup.compact_orders)
+        self._rollups = {}
+        # Running spend statistics, updated for every new order
+        self._spend = SpendTotal()
+        self._coffee_counts = {}
+        self._favourite_coffee = None
+        self._favourite_count = 0
+        # Register with the shop last, once the customer is fully built
+        if shop is not None:
+            shop._register_customer(self)
     
     @property
     def name(self) -> str:
@@ -53,9 +101,54 @@ class Customer:
         # If validation passes, assign the value to the private attribute
         self._name = value
 
+    def _add_order(self, order: Order) -> None:
+        """Add an order to this customer's orders list. (Internal method)"""
+        # Append the order to this customer's list (called by create_order or Shop)
+        self._orders.append(order)
+        # Update the running totals used by spend_profile()
+        self._spend.add_order(order)
+        # Count this coffee and promote it if it overtakes the current favourite
+        count = self._coffee_counts.get(order.coffee, 0) + 1
+        self._coffee_counts[order.coffee] = count
+        if count > self._favourite_count:
+            self._favourite_coffee = order.coffee
+            self._favourite_count = count
+
+    def spend_profile(self) -> SpendProfile:
+        """
+        Return this customer's spend statistics in O(1).
+
+        The statistics are kept up to date by create_order and are not
+        affected by compacting old orders into rollups.
+        """
+        spend = self._spend
+        total = spend.total()
+        # Average ticket (0.0 when there are no orders)
+        average = total / spend.count if spend.count else 0.0
+        return SpendProfile(
+            spend.count,
+            spend.total_cents(),
+            total,
+            average,
+            self._favourite_coffee,
+            self._favourite_count,
+        )
+
+    def _orders_and_rollups(self) -> tuple[list[Order], dict]:
+        """
+        Return this customer's raw orders and rollups as one consistent pair. (Internal method)
+
+        See Coffee._orders_and_rollups; shop compaction swaps both under the shop lock.
+        """
+        lock = getattr(self._shop, '_lock', None)
+        if lock is None:
+            return self._orders, self._rollups
+        with lock:
+            return self._orders, self._rollups
+
     def orders(self) -> list[Order]:
         """
-        Return a copy of the list of orders belonging to this customer.
+        Return a copy of the list of (not compacted) orders belonging to this customer.
         """
         # Return a copy to prevent external modification of the internal list
         return self._orders.copy()
@@ -64,49 +157,87 @@ class Customer:
         """
         Return a list of unique Coffee instances that this customer has ordered.
         """
+        # Read the raw orders and rollups together
+        orders, rollups = self._orders_and_rollups()
         # Create an empty set to store unique coffee objects
         coffees_set = set()
         # Iterate through all orders for this customer
-        for order in self._orders:
+        for order in orders:
             # Add each coffee from the order to the set (duplicates are automatically ignored)
             coffees_set.add(order.coffee)
+        # Add the coffees of compacted orders as well
+        coffees_set.update(coffee for _, coffee in rollups)
         # Convert the set back to a list and return
         return list(coffees_set)
 
-    def create_order(self, coffee: Coffee, price: float) -> Order:
+    def create_order(self, coffee: Coffee, price: float | None = None,
+                     *, price_cents: int | None = None,
+                     created_at: float | None = None) -> Order:
         """
         Create a new Order instance for this customer with the given coffee and price.
         
         Args:
             coffee (Coffee): The Coffee instance to order.
             price (float): The price of the coffee (should be between 1.0 and 10.0).
+            price_cents (int): The price in integer cents, instead of price (100 to 1000).
+            created_at (float): Unix timestamp of the order (defaults to now).
         
         Returns:
             Order: The newly created Order instance.
         
         Raises:
             TypeError: If coffee is not an instance of Coffee.
+            ValueError: If coffee belongs to a different shop than this customer.
         """
         # Check if coffee has a 'name' attribute to verify it's a Coffee instance
         if not hasattr(coffee, 'name'):
             raise TypeError("coffee must be an instance of Coffee class")
+        # Customers can only order coffees from their own shop
+        if getattr(coffee, '_shop', None) is not self._shop:
+            raise ValueError("coffee must belong to the same shop as the customer")
         
         # Create a new Order with this customer, the coffee, and the price
         # The Order constructor will validate the price automatically
-        new_order = Order(self, coffee, price)
+        new_order = Order(self, coffee, price, price_cents=price_cents, created_at=created_at)
+        # Orders of shop customers are recorded by (and only by) their shop
+        if self._shop is not None:
+            self._shop._record(new_order)
+            return new_order
         # Add the order to this customer's list
-        self._orders.append(new_order)
+        self._add_order(new_order)
         # Add the order to the class-wide list for tracking all orders
         Customer._all_orders.append(new_order)
         # Add the order to the coffee's order list to maintain bidirectional relationship
         coffee._add_order(new_order)
+        # Publish the order to the event stream; subscribers run off the hot path
+        if Customer._event_stream is not None:
+            Customer._event_stream.publish(new_order)
         # Return the created order
         return new_order
 
+    @classmethod
+    def set_event_stream(cls, stream: OrderEventStream | None) -> None:
+        """
+        Set the OrderEventStream that create_order publishes new orders to.
+
+        Args:
+            stream (OrderEventStream | None): The stream to use, or None to stop publishing.
+        """
+        # Check the stream has a publish method before installing it
+        if stream is not None and not hasattr(stream, 'publish'):
+            raise TypeError("stream must be an OrderEventStream instance")
+        # Store the stream on the class so every customer shares it
+        Customer._event_stream = stream
+
     @classmethod
     def most_aficionado(cls, coffee: Coffee) -> Customer | None:
         """
         Find the customer who has spent the most money on a given coffee.
+
+        Spending includes orders that were compacted into rollups. It is
+        compared in exact integer cents when every order of the coffee was
+        priced with price_cents; otherwise the float prices are summed, so
+        sub-cent float prices rank customers as they always have.
         
         Args:
             coffee (Coffee): The coffee to check against.
@@ -115,27 +246,30 @@ class Customer:
             Customer: The customer who spent the most money on this coffee.
             None: If no customers found for this coffee.
         """
+        # Read the raw orders and the rollups of compacted orders together
+        orders, rollups = coffee._orders_and_rollups()
         # Check if the coffee has any orders at all
-        if not coffee.orders():
+        if not orders and not rollups:
             # No orders found, so return None
             return None
         
         # Create an empty dictionary to track total spending per customer
         spending = {}
-        # Iterate through all orders for this particular coffee
-        for order in coffee.orders():
+        # Start with the spending summarized in rollups: they hold the oldest
+        # orders, so customers are added in the order they first ordered
+        for (_, cust), rollup in rollups.items():
+            if cust not in spending:
+                spending[cust] = SpendTotal()
+            spending[cust].add_rollup(rollup)
+        # Iterate through all raw orders for this particular coffee
+        for order in orders:
             # Get the customer from the order
             cust = order.customer
-            # Add the order price to that customer's total (or 0 if first time)
-            spending[cust] = spending.get(cust, 0) + order.price
-        
-        # Check if spending dictionary has any entries
-        if not spending:
-            # No spending data, return None
-            return None
+            # Add the order price to that customer's total (created if first time)
+            if cust not in spending:
+                spending[cust] = SpendTotal()
+            spending[cust].add_order(order)
         
-        # Use the max() function with key parameter to find customer with highest spending
-        # The key parameter specifies that we want to compare by the dictionary values (prices)
-        max_spender = max(spending, key=spending.get)
-        # Return the customer who spent the most
-        return max_spender
+        # Return the customer with the highest total (None if there is no spending);
+        # on a tie max() keeps the customer who ordered first
+        return top_spender(spending)
@@ -0,0 +1,382 @@
+# Enable forward references for type hints
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable
+
+# Use TYPE_CHECKING to avoid circular imports at runtime
+# Order is only imported for type hinting, not actual execution
+if TYPE_CHECKING:
+    from order import Order
+
+
+# Drop policies understood by OrderEventStream when the queue is full
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+DROP_POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST)
+
+
+class OrderEvent:
+    """
+    OrderEvent represents a single "order created" change in the coffee shop.
+
+    Attributes:
+        sequence (int): Position of the event in its stream, starting at 1.
+        order (Order): The order that was created.
+        published_at (float): time.monotonic() value when the event was queued.
+    """
+
+    __slots__ = ("sequence", "order", "published_at")
+
+    def __init__(self, sequence: int, order: Order, published_at: float):
+        """Initialize an OrderEvent for an order queued at published_at."""
+        self.sequence = sequence
+        self.order = order
+        self.published_at = published_at
+
+    def __repr__(self) -> str:
+        """Return a short debugging representation of the event."""
+        return f"OrderEvent(sequence={self.sequence}, order={self.order!r})"
+
+
+class OrderEventStream:
+    """
+    OrderEventStream is a bounded in-process queue of order events.
+
+    Customer.create_order publishes into the stream, and subscribers receive
+    the events in batches from a background worker thread (start/stop) or an
+    asyncio task (run_async), so listeners never run on the order hot path.
+
+    Attributes:
+        maxsize (int): Maximum number of events waiting in the queue.
+        batch_size (int): Maximum number of events handed to a subscriber at once.
+        drop_policy (str): What publish does when the queue is full:
+            "drop_oldest" (the default) evicts the oldest queued event,
+            "drop_newest" discards the event being published,
+            "block" waits for room (up to block_timeout seconds).
+            A publish made by the consumer itself (the worker thread, a
+            subscriber, or code on the thread running run_async) never
+            blocks, since nothing else could make room; under "block" the
+            event is dropped instead.
+        block_timeout (float | None): Longest time publish blocks under the
+            "block" policy before dropping the event. None waits forever,
+            which is only safe when the consumer runs on another thread.
+    """
+
+    def __init__(self, maxsize: int = 1024, batch_size: int = 64,
+                 drop_policy: str = DROP_OLDEST, block_timeout: float | None = 0.1):
+        """
+        Initialize an empty stream.
+
+        Raises:
+            ValueError: If maxsize or batch_size is not positive, or the
+                drop_policy is unknown.
+        """
+        # Validate the queue limits
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        # Validate the drop policy against the supported values
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"drop_policy must be one of {DROP_POLICIES}")
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.drop_policy = drop_policy
+        self.block_timeout = block_timeout
+        # Queued events waiting for dispatch
+        self._queue = deque()
+        # Condition guards the queue and wakes both producers and the worker
+        self._cond = threading.Condition()
+        # Registered subscriber callables, each receiving a list of events
+        self._subscribers = []
+        # Counters exposed through metrics()
+        self._sequence = 0
+        self._published = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._errors = 0
+        self._skipped = 0
+        self._max_depth = 0
+        self._last_lag = 0.0
+        # Background worker state
+        self._worker = None
+        self._running = False
+        # Idents of threads currently consuming (worker, run_async, drain),
+        # counted so nested consumers (drain inside the worker) unwind correctly
+        self._consumer_threads = Counter()
+
+    def subscribe(self, callback: Callable[[list[OrderEvent]], object]) -> None:
+        """
+        Register a subscriber that receives lists of OrderEvent objects.
+
+        Coroutine functions are supported when the stream is driven by
+        run_async; they are awaited in order with the other subscribers.
+        Synchronous delivery (start or drain) skips them and counts the
+        events they missed in metrics()["skipped"].
+        """
+        # Make sure the subscriber can actually be called
+        if not callable(callback):
+            raise TypeError("subscriber must be callable")
+        with self._cond:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[list[OrderEvent]], object]) -> None:
+        """Remove a previously registered subscriber."""
+        with self._cond:
+            self._subscribers.remove(callback)
+
+    def publish(self, order: Order) -> bool:
+        """
+        Queue an order-created event for the subscribers.
+
+        Returns:
+            bool: True if the event was queued, False if it was dropped.
+        """
+        with self._cond:
+            # Apply the drop policy when the queue is already full
+            if len(self._queue) >= self.maxsize:
+                if self.drop_policy == DROP_NEWEST:
+                    self._dropped += 1
+                    return False
+                if self.drop_policy == DROP_OLDEST:
+                    self._queue.popleft()
+                    self._dropped += 1
+                elif threading.get_ident() in self._consumer_threads:
+                    # The consumer cannot wait for itself to make room
+                    self._dropped += 1
+                    return False
+                else:
+                    # Block until the consumer makes room or the timeout expires
+                    has_room = self._cond.wait_for(
+                        lambda: len(self._queue) < self.maxsize,
+                        timeout=self.block_timeout,
+                    )
+                    if not has_room:
+                        self._dropped += 1
+                        return False
+            # Assign the next sequence number and queue the event
+            self._sequence += 1
+            self._queue.append(OrderEvent(self._sequence, order, time.monotonic()))
+            self._published += 1
+            self._max_depth = max(self._max_depth, len(self._queue))
+            # Wake up the worker waiting for events
+            self._cond.notify_all()
+            return True
+
+    def _take_batch(self, timeout: float | None = None) -> list[OrderEvent]:
+        """Remove and return up to batch_size queued events. (Internal method)"""
+        with self._cond:
+            # Wait for events unless the stream is being drained without a worker
+            if timeout is not None and not self._queue:
+                self._cond.wait_for(lambda: self._queue or not self._running, timeout=timeout)
+            batch = []
+            while self._queue and len(batch) < self.batch_size:
+                batch.append(self._queue.popleft())
+            if batch:
+                # Remember how long the oldest event in the batch waited
+                self._last_lag = time.monotonic() - batch[0].published_at
+                # Producers blocked on a full queue can continue now
+                self._cond.notify_all()
+            return batch
+
+    def _subscribers_snapshot(self) -> list:
+        """Return a copy of the subscriber list. (Internal method)"""
+        with self._cond:
+            return list(self._subscribers)
+
+    def _dispatch(self, batch: list[OrderEvent]) -> None:
+        """Hand a batch to every synchronous subscriber. (Internal method)"""
+        errors = 0
+        skipped = 0
+        for callback in self._subscribers_snapshot():
+            # Coroutine subscribers need run_async; calling them here would lose the batch
+            if inspect.iscoroutinefunction(callback):
+                skipped += len(batch)
+                continue
+            try:
+                result = callback(batch)
+            except Exception:
+                # A failing subscriber must not stop delivery to the others
+                errors += 1
+                continue
+            if inspect.isawaitable(result):
+                # An awaitable cannot be run from here; close it and report the miss
+                if hasattr(result, 'close'):
+                    result.close()
+                skipped += len(batch)
+        self._count_dispatch(batch, errors, skipped)
+
+    async def _dispatch_async(self, batch: list[OrderEvent]) -> None:
+        """
+        Hand a batch to every subscriber, awaiting coroutines. (Internal method)
+
+        If the task is cancelled while a subscriber is awaited, that subscriber
+        is counted as an error, the batch is still handed to the remaining
+        subscribers and counted, and CancelledError is raised afterwards.
+        """
+        errors = 0
+        cancelled = None
+        for callback in self._subscribers_snapshot():
+            try:
+                result = callback(batch)
+                if inspect.isawaitable(result):
+                    await result
+            except asyncio.CancelledError as exc:
+                # Finish the in-flight batch before honouring the cancellation
+                errors += 1
+                cancelled = exc
+            except Exception:
+                # A failing subscriber must not stop delivery to the others
+                errors += 1
+        self._count_dispatch(batch, errors, 0)
+        if cancelled is not None:
+            raise cancelled
+
+    def _count_dispatch(self, batch: list[OrderEvent], errors: int, skipped: int) -> None:
+        """Update the delivery counters for a dispatched batch. (Internal method)"""
+        with self._cond:
+            self._delivered += len(batch)
+            self._errors += errors
+            self._skipped += skipped
+
+    @contextmanager
+    def _consuming(self):
+        """Mark the calling thread as a consumer while the block runs. (Internal method)"""
+        ident = threading.get_ident()
+        with self._cond:
+            self._consumer_threads[ident] += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._consumer_threads[ident] -= 1
+                if not self._consumer_threads[ident]:
+                    del self._consumer_threads[ident]
+
+    def drain(self) -> int:
+        """
+        Dispatch every queued event in the calling thread.
+
+        Returns:
+            int: Number of events dispatched.
+        """
+        count = 0
+        with self._consuming():
+            # Keep taking batches until the queue is empty
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    return count
+                self._dispatch(batch)
+                count += len(batch)
+
+    def _run_worker(self, poll_interval: float) -> None:
+        """Background thread loop dispatching batches. (Internal method)"""
+        with self._consuming():
+            while self._running:
+                batch = self._take_batch(timeout=poll_interval)
+                if batch:
+                    self._dispatch(batch)
+            # Deliver whatever is still queued when the worker is stopped
+            self.drain()
+
+    def start(self, poll_interval: float = 0.1) -> None:
+        """Start the background worker thread that dispatches batches."""
+        with self._cond:
+            if self._running or (self._worker is not None and self._worker.is_alive()):
+                raise RuntimeError("event stream is already running")
+            self._running = True
+        self._worker = threading.Thread(
+            target=self._run_worker, args=(poll_interval,),
+            name="order-event-stream", daemon=True,
+        )
+        self._worker.start()
+
+    def stop(self, timeout: float | None = None) -> bool:
+        """
+        Stop the worker after it has delivered the queued events.
+
+        Returns:
+            bool: True if the worker has exited, False if it was still busy
+                when timeout expired (it keeps running until its subscribers return).
+        """
+        with self._cond:
+            self._running = False
+            # Wake the worker so it notices the stop request
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            # Keep the reference while the thread is still alive
+            if self._worker.is_alive():
+                return False
+            self._worker = None
+        return True
+
+    async def run_async(self, poll_interval: float = 0.01) -> None:
+        """
+        Dispatch batches from an asyncio task until the task is cancelled.
+
+        Typical use is asyncio.create_task(stream.run_async()). Coroutine
+        subscribers are awaited; plain callables are called directly.
+        Orders published from the loop's thread while the queue is full are
+        dropped rather than blocking the loop.
+        """
+        with self._consuming():
+            await self._run_async_loop(poll_interval)
+
+    async def _run_async_loop(self, poll_interval: float) -> None:
+        """Body of run_async, run while marked as a consumer. (Internal method)"""
+        try:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    # Yield to the event loop while the queue is empty
+                    await asyncio.sleep(poll_interval)
+                    continue
+                await self._dispatch_async(batch)
+        except asyncio.CancelledError:
+            # Deliver what is left to every subscriber, awaiting coroutines, then stop
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    break
+                await self._dispatch_async(batch)
+            raise
+
+    def metrics(self) -> dict:
+        """
+        Return a dictionary describing the state of the stream.
+
+        Keys:
+            depth: Events currently waiting in the queue.
+            max_depth: Highest depth seen so far.
+            published: Events accepted by publish().
+            delivered: Events handed to subscribers.
+            dropped: Events discarded by the drop policy.
+            errors: Subscriber calls that raised an exception.
+            skipped: Events not given to coroutine subscribers because
+                they were dispatched synchronously (start or drain).
+            lag_seconds: Age of the oldest queued event, or 0.0 if empty.
+            last_batch_lag_seconds: Queue wait of the last dispatched batch.
+        """
+        with self._cond:
+            depth = len(self._queue)
+            lag = time.monotonic() - self._queue[0].published_at if depth else 0.0
+            return {
+                "depth": depth,
+                "max_depth": self._max_depth,
+                "published": self._published,
+                "delivered": self._delivered,
+                "dropped": self._dropped,
+                "errors": self._errors,
+                "skipped": self._skipped,
+                "lag_seconds": lag,
+                "last_batch_lag_seconds": self._last_lag,
+            }
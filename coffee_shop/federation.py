@@ -0,0 +1,186 @@
+# Enable forward references for type hints
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Iterable
+
+# Import the snapshot helper so exported state is read from a consistent view
+from snapshot import snapshot
+
+# Use TYPE_CHECKING to avoid circular imports at runtime
+# These classes are only imported for type hinting, not actual execution
+if TYPE_CHECKING:
+    from order import Order
+    from shop import Shop
+    from snapshot import Snapshot
+
+
+class AggregateState:
+    """
+    AggregateState is a compact, mergeable summary of one store's orders.
+
+    For every (customer name, coffee name) pair it keeps the order count and
+    the exact spend in cents. Merging adds the pairs together, which is
+    associative and commutative, so the states of any number of stores can
+    be combined in any order and still give exact chain-wide answers.
+
+    Customers and coffees are identified by name: the name is the key
+    that matches a customer across stores, so the same customer must use the
+    same name everywhere, and within one store a name must belong to a
+    single Customer (and a single Coffee). Building a state from orders where
+    two distinct objects share a name raises ValueError, because their
+    totals would otherwise be silently combined and the answers would no
+    longer match Customer.most_aficionado for that store.
+    """
+
+    # Version number written by to_dict and checked by from_dict
+    FORMAT_VERSION = 1
+
+    def __init__(self):
+        """Initialize an empty state (the identity element of merge)."""
+        # (customer name, coffee name) -> [order count, spend in cents]
+        self._pairs = {}
+        # Objects seen per name while adding orders; not serialized or merged
+        self._customers_by_name = {}
+        self._coffees_by_name = {}
+
+    @staticmethod
+    def _check_name(seen: dict, item, kind: str) -> None:
+        """Raise if a different object already used this name. (Internal method)"""
+        known = seen.setdefault(item.name, item)
+        if known is not item:
+            raise ValueError(f"two different {kind} objects are both named {item.name!r}; "
+                             "names must identify them uniquely within a store")
+
+    def _add(self, customer_name: str, coffee_name: str, count: int, spend_cents: int) -> None:
+        """Add count orders totalling spend_cents to a pair. (Internal method)"""
+        totals = self._pairs.setdefault((customer_name, coffee_name), [0, 0])
+        totals[0] += count
+        totals[1] += spend_cents
+
+    def add_order(self, order: Order) -> None:
+        """
+        Add a single order to the state.
+
+        Raises:
+            ValueError: If another customer or coffee with the same name was added.
+        """
+        self._check_name(self._customers_by_name, order.customer, "customer")
+        self._check_name(self._coffees_by_name, order.coffee, "coffee")
+        self._add(order.customer.name, order.coffee.name, 1, order.price_cents)
+
+    @classmethod
+    def from_orders(cls, orders: Iterable[Order], rollups: Iterable = ()) -> AggregateState:
+        """
+        Build a state from orders and, optionally, rollups of compacted orders.
+
+        Raises:
+            ValueError: If two distinct customers (or coffees) share a name.
+        """
+        state = cls()
+        for order in orders:
+            state.add_order(order)
+        for rollup in rollups:
+            state._check_name(state._customers_by_name, rollup.customer, "customer")
+            state._check_name(state._coffees_by_name, rollup.coffee, "coffee")
+            state._add(rollup.customer.name, rollup.coffee.name, rollup.count, rollup.spend_cents)
+        return state
+
+    @classmethod
+    def from_snapshot(cls, view: Snapshot) -> AggregateState:
+        """Build a state from a point-in-time snapshot."""
+        return cls.from_orders(view.orders(), view.rollups())
+
+    @classmethod
+    def from_shop(cls, shop: Shop | None = None) -> AggregateState:
+        """Build a state from a shop, or from the global registry if shop is None."""
+        return cls.from_snapshot(snapshot(shop))
+
+    def merge(self, *others: AggregateState) -> AggregateState:
+        """Return a new state combining this state with others."""
+        result = AggregateState()
+        for state in (self,) + others:
+            if not isinstance(state, AggregateState):
+                raise TypeError("can only merge AggregateState instances")
+            for (customer_name, coffee_name), (count, spend_cents) in state._pairs.items():
+                result._add(customer_name, coffee_name, count, spend_cents)
+        return result
+
+    @classmethod
+    def merge_all(cls, states: Iterable[AggregateState]) -> AggregateState:
+        """Merge any number of states; an empty iterable gives an empty state."""
+        return cls().merge(*states)
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation of the state."""
+        return {
+            "version": self.FORMAT_VERSION,
+            "pairs": [[customer_name, coffee_name, count, spend_cents]
+                      for (customer_name, coffee_name), (count, spend_cents)
+                      in sorted(self._pairs.items())],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> AggregateState:
+        """
+        Rebuild a state from to_dict output.
+
+        Raises:
+            ValueError: If the data has an unsupported version.
+        """
+        if data.get("version") != cls.FORMAT_VERSION:
+            raise ValueError("unsupported aggregate state version")
+        state = cls()
+        for customer_name, coffee_name, count, spend_cents in data["pairs"]:
+            state._add(customer_name, coffee_name, count, spend_cents)
+        return state
+
+    def to_json(self) -> str:
+        """Serialize the state as a JSON string."""
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, text: str) -> AggregateState:
+        """Rebuild a state from a JSON string produced by to_json."""
+        return cls.from_dict(json.loads(text))
+
+    def coffees(self) -> list[str]:
+        """Return the sorted names of all coffees in the state."""
+        return sorted({coffee_name for _, coffee_name in self._pairs})
+
+    def num_orders(self, coffee_name: str) -> int:
+        """Return the number of orders for a coffee."""
+        return sum(count for (_, name), (count, _) in self._pairs.items() if name == coffee_name)
+
+    def total_price_cents(self, coffee_name: str) -> int:
+        """Return the exact total spent on a coffee, in cents."""
+        return sum(spend for (_, name), (_, spend) in self._pairs.items() if name == coffee_name)
+
+    def average_price(self, coffee_name: str) -> float:
+        """Return the average price of a coffee (0.0 without orders)."""
+        count = self.num_orders(coffee_name)
+        if not count:
+            return 0.0
+        return self.total_price_cents(coffee_name) / count / 100
+
+    def most_aficionado(self, coffee_name: str) -> str | None:
+        """
+        Return the name of the customer who spent the most on a coffee.
+
+        Ties go to the alphabetically first name, so the answer does not
+        depend on the order in which states were merged.
+        """
+        best = None
+        for (customer_name, name), (_, spend) in self._pairs.items():
+            if name != coffee_name:
+                continue
+            candidate = (-spend, customer_name)
+            if best is None or candidate < best:
+                best = candidate
+        return None if best is None else best[1]
+
+    def __eq__(self, other) -> bool:
+        """Return True if both states hold the same totals."""
+        if not isinstance(other, AggregateState):
+            return NotImplemented
+        return self._pairs == other._pairs
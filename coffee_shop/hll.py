@@ -0,0 +1,167 @@
+# Enable forward references for type hints
+from __future__ import annotations
+
+import hashlib
+import math
+from typing import Iterable, NamedTuple
+
+
+class DistinctEstimate(NamedTuple):
+    """
+    Result of an approximate distinct count.
+
+    Attributes:
+        estimate (int): The estimated number of distinct items.
+        relative_error (float): Relative standard error of the estimate
+            (1.04 / sqrt(m) for a HyperLogLog with m registers, 0.0 if exact).
+        low (int): Lower end of the ~95% interval (estimate minus two standard errors).
+        high (int): Upper end of the ~95% interval (estimate plus two standard errors).
+    """
+
+    estimate: int
+    relative_error: float
+    low: int
+    high: int
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch for approximate distinct counting in fixed memory.
+
+    The sketch keeps m = 2 ** precision one-byte registers, so precision 12
+    uses 4 KB and has a relative standard error of 1.04 / sqrt(4096) ~= 1.6%.
+    Sketches with the same precision can be merged; the merge of two sketches
+    is exactly the sketch of the union of their inputs.
+
+    Attributes:
+        precision (int): Number of index bits, between 4 and 16.
+    """
+
+    MIN_PRECISION = 4
+    MAX_PRECISION = 16
+
+    def __init__(self, precision: int = 12):
+        """
+        Initialize an empty sketch.
+
+        Raises:
+            TypeError: If precision is not an integer.
+            ValueError: If precision is outside 4..16.
+        """
+        # Check the precision type before using it for bit shifts
+        if not isinstance(precision, int):
+            raise TypeError("precision must be an integer")
+        # Check that the register count stays within a sensible range
+        if not (self.MIN_PRECISION <= precision <= self.MAX_PRECISION):
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        # One byte per register holds the longest run of leading zeros seen
+        self._registers = bytearray(1 << precision)
+
+    @property
+    def num_registers(self) -> int:
+        """Get the number of registers (m) in the sketch."""
+        return len(self._registers)
+
+    @property
+    def relative_error(self) -> float:
+        """Get the relative standard error of the sketch (1.04 / sqrt(m))."""
+        return 1.04 / math.sqrt(self.num_registers)
+
+    @staticmethod
+    def _hash(item) -> int:
+        """Return a 64-bit hash of the item's string form. (Internal method)"""
+        digest = hashlib.blake2b(str(item).encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    def add(self, item) -> None:
+        """Add an item to the sketch."""
+        h = self._hash(item)
+        # The top precision bits choose the register
+        index = h >> (64 - self.precision)
+        # The remaining bits give the position of the first 1-bit
+        remaining_bits = 64 - self.precision
+        rest = h & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - rest.bit_length() + 1
+        # Keep the largest rank observed for this register
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def update(self, items: Iterable) -> None:
+        """Add every item from an iterable to the sketch."""
+        for item in items:
+            self.add(item)
+
+    def _check_compatible(self, other: HyperLogLog) -> None:
+        """Raise if other cannot be merged with this sketch. (Internal method)"""
+        if not isinstance(other, HyperLogLog):
+            raise TypeError("can only merge with another HyperLogLog")
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches with different precision")
+
+    def merge_in(self, other: HyperLogLog) -> None:
+        """Merge another sketch into this one in place."""
+        self._check_compatible(other)
+        # The union keeps the maximum of each register pair
+        self._registers = bytearray(map(max, self._registers, other._registers))
+
+    def merge(self, *others: HyperLogLog) -> HyperLogLog:
+        """Return a new sketch for the union of this sketch and others."""
+        result = self.copy()
+        for other in others:
+            result.merge_in(other)
+        return result
+
+    def copy(self) -> HyperLogLog:
+        """Return an independent copy of the sketch."""
+        result = HyperLogLog(self.precision)
+        result._registers = bytearray(self._registers)
+        return result
+
+    def cardinality(self) -> int:
+        """Return the estimated number of distinct items added."""
+        m = self.num_registers
+        # Bias-correction constant from the HyperLogLog paper
+        if m == 16:
+            alpha = 0.673
+        elif m == 32:
+            alpha = 0.697
+        elif m == 64:
+            alpha = 0.709
+        else:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self._registers)
+        # Use linear counting while many registers are still empty
+        zeros = self._registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+    def estimate(self) -> DistinctEstimate:
+        """Return the cardinality estimate with its error bound."""
+        value = self.cardinality()
+        error = self.relative_error
+        margin = 2 * error * value
+        return DistinctEstimate(value, error, max(0, math.floor(value - margin)),
+                                math.ceil(value + margin))
+
+    def to_bytes(self) -> bytes:
+        """Serialize the sketch as one precision byte followed by the registers."""
+        return bytes([self.precision]) + bytes(self._registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> HyperLogLog:
+        """
+        Rebuild a sketch serialized with to_bytes.
+
+        Raises:
+            ValueError: If data is empty or the register count does not
+                match the precision.
+        """
+        if not data:
+            raise ValueError("serialized sketch is empty")
+        sketch = cls(data[0])
+        if len(data) - 1 != sketch.num_registers:
+            raise ValueError("serialized sketch has the wrong number of registers")
+        sketch._registers = bytearray(data[1:])
+        return sketch
@@ -1,5 +1,6 @@
 # Enable forward references for type hints
 from __future__ import annotations
+import time
 from typing import TYPE_CHECKING
 
 # Use TYPE_CHECKING to avoid circular imports at runtime
@@ -13,25 +14,51 @@ class Order:
     Order class represents an order placed by a customer for a coffee, with a price.
     """
 
-    def __init__(self, customer: Customer, coffee: Coffee, price: float):
+    # Valid price range expressed in integer cents (1.00 to 10.00)
+    MIN_PRICE_CENTS = 100
+    MAX_PRICE_CENTS = 1000
+
+    def __init__(self, customer: Customer, coffee: Coffee, price: float | None = None,
+                 *, price_cents: int | None = None, created_at: float | None = None):
         """
         Initialize an Order with a customer, coffee, and price.
+
+        The price can be given either as a float (price) or as an exact
+        integer number of cents (price_cents); exactly one must be provided.
         
         Args:
             customer (Customer): The customer who made the order.
             coffee (Coffee): The coffee that was ordered.
             price (float): Price of the coffee (between 1.0 and 10.0).
+            price_cents (int): Price of the coffee in cents (between 100 and 1000).
+            created_at (float): When the order was placed, as a Unix timestamp
+                (defaults to the current time).
         
         Raises:
-            TypeError: If customer or coffee are not instances of respective classes.
+            TypeError: If customer or coffee are not instances of respective classes,
+                if neither/both of price and price_cents are given, or if
+                created_at is not a number.
             ValueError: If price is not between 1.0 and 10.0.
         """
         # Set customer using the property setter to validate the input
         self.customer = customer
         # Set coffee using the property setter to validate the input
         self.coffee = coffee
-        # Set price using the property setter to validate the input and convert to float
-        self.price = price
+        # Exactly one way of giving the price must be used
+        if (price is None) == (price_cents is None):
+            raise TypeError("provide exactly one of price or price_cents")
+        if price_cents is not None:
+            # Set the exact integer price; the float price is derived from it
+            self.price_cents = price_cents
+        else:
+            # Set price using the property setter to validate the input and convert to float
+            self.price = price
+        # Record when the order was placed (used by rollup compaction)
+        if created_at is None:
+            created_at = time.time()
+        if not isinstance(created_at, (int, float)):
+            raise TypeError("created_at must be a number")
+        self._created_at = float(created_at)
 
     @property
     def customer(self) -> Customer:
@@ -63,6 +90,12 @@ class Order:
         # If validation passes, assign to the private attribute
         self._coffee = value
 
+    @property
+    def created_at(self) -> float:
+        """Get the Unix timestamp at which this order was placed."""
+        # Return the private _created_at attribute
+        return self._created_at
+
     @property
     def price(self) -> float:
         """Get the price of this order."""
@@ -80,3 +113,104 @@ class Order:
             raise ValueError("price must be between 1.0 and 10.0")
         # If validation passes, convert to float and assign to the private attribute
         self._price = float(value)
+        # Keep the price in whole cents as well, rounded to the nearest cent;
+        # aggregates of float-priced orders still sum the float prices
+        self._price_cents = round(self._price * 100)
+        self._cents_priced = False
+
+    @property
+    def price_cents(self) -> int:
+        """
+        Get the price of this order in integer cents.
+
+        Exact for orders priced with price_cents; for float prices it is the
+        price rounded to the nearest cent.
+        """
+        # Return the private _price_cents attribute
+        return self._price_cents
+
+    @property
+    def cents_priced(self) -> bool:
+        """Get whether the price was given in exact integer cents (price_cents)."""
+        # Return the private _cents_priced attribute
+        return self._cents_priced
+
+    @price_cents.setter
+    def price_cents(self, value: int):
+        """Set and validate the price for this order in integer cents."""
+        # Check if the value is an integer (bool is excluded on purpose)
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise TypeError("price_cents must be an integer")
+        # Check if it's in the valid range (100 to 1000 cents)
+        if not (self.MIN_PRICE_CENTS <= value <= self.MAX_PRICE_CENTS):
+            raise ValueError("price_cents must be between 100 and 1000")
+        # Store the exact cents and the matching float price
+        self._price_cents = value
+        self._price = value / 100
+        self._cents_priced = True
+
+
+class SpendTotal:
+    """
+    SpendTotal is a running total of order prices.
+
+    Integer cents are only exact for orders priced with price_cents, so the
+    total keeps both the cents and the float sum of the prices. While every
+    order added is cents-priced the cents are used; as soon as one float-priced
+    order is added, totals and comparisons fall back to the float sum, which
+    is what the float-priced API has always computed.
+
+    Attributes:
+        count (int): Number of orders added.
+        cents (int): Sum of the prices in cents.
+        amount (float): Sum of the float prices.
+        exact (bool): True while every order added was cents-priced.
+    """
+
+    __slots__ = ("count", "cents", "amount", "exact")
+
+    def __init__(self):
+        """Initialize an empty total."""
+        self.count = 0
+        self.cents = 0
+        self.amount = 0.0
+        self.exact = True
+
+    def add_order(self, order: Order) -> None:
+        """Add the price of one order."""
+        self.count += 1
+        self.cents += order.price_cents
+        self.amount += order.price
+        if not order.cents_priced:
+            self.exact = False
+
+    def add_rollup(self, rollup) -> None:
+        """Add the orders summarized in a rollup (see rollup.OrderRollup)."""
+        self.count += rollup.count
+        self.cents += rollup.spend_cents
+        self.amount += rollup.spend
+        if not rollup.exact:
+            self.exact = False
+
+    def total(self) -> float:
+        """Return the total as a float."""
+        return self.cents / 100 if self.exact else self.amount
+
+    def total_cents(self) -> int:
+        """Return the total in cents (the rounded float sum when not exact)."""
+        return self.cents if self.exact else round(self.amount * 100)
+
+
+def top_spender(spending: dict):
+    """
+    Return the key of the largest SpendTotal in spending, or None if it is empty.
+
+    The totals are compared in cents only if all of them are exact, so
+    float-priced orders are ranked by their float sums as before. On a tie the
+    first key in the dictionary wins.
+    """
+    if not spending:
+        return None
+    if all(total.exact for total in spending.values()):
+        return max(spending, key=lambda key: spending[key].cents)
+    return max(spending, key=lambda key: spending[key].amount)
@@ -0,0 +1,124 @@
+# Enable forward references for type hints
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable
+
+# Import the spend accumulator so totals match Coffee and Customer
+from order import SpendTotal, top_spender
+# Import the snapshot support used to read registries consistently
+from snapshot import Snapshot, snapshot
+
+# Use TYPE_CHECKING to avoid circular imports at runtime
+# These classes are only imported for type hinting, not actual execution
+if TYPE_CHECKING:
+    from coffee import Coffee
+    from order import Order
+
+
+# Metric names understood by run_queries
+NUM_ORDERS = "num_orders"
+TOTAL_PRICE_CENTS = "total_price_cents"
+AVERAGE_PRICE = "average_price"
+MOST_AFICIONADO = "most_aficionado"
+DISTINCT_CUSTOMERS = "distinct_customers"
+METRICS = (NUM_ORDERS, TOTAL_PRICE_CENTS, AVERAGE_PRICE, MOST_AFICIONADO, DISTINCT_CUSTOMERS)
+
+
+class _CoffeeTotals:
+    """Running totals of one coffee during a batch pass. (Internal class)"""
+
+    __slots__ = ("total", "spending")
+
+    def __init__(self):
+        """Initialize empty totals."""
+        self.total = SpendTotal()
+        # Customer -> SpendTotal; only filled when a metric needs customers
+        self.spending = {}
+
+
+def _resolve_source(source) -> tuple[Iterable[Order], Iterable]:
+    """Return (orders, rollups) for a query source. (Internal function)"""
+    # No source means the global registry; a Shop is read through a snapshot
+    if source is None:
+        source = snapshot()
+    elif hasattr(source, 'snapshot'):
+        source = source.snapshot()
+    if isinstance(source, Snapshot):
+        # Stream the frozen prefix directly instead of copying it
+        return source.iter_orders(), source.iter_rollups()
+    # Anything else is treated as an iterable (or generator) of orders
+    return source, ()
+
+
+def run_queries(metrics: Iterable[str], source=None) -> dict[str, dict[Coffee, object]]:
+    """
+    Compute several per-coffee metrics in a single pass over the orders.
+
+    Args:
+        metrics: Names of the metrics to compute; any of num_orders,
+            total_price_cents, average_price, most_aficionado and
+            distinct_customers.
+        source: None for the global registry (Customer._all_orders and its
+            rollups), a Shop, a Snapshot, or any iterable of orders such as
+            a generator. Registries are read through a snapshot, so the
+            results are consistent even while orders are being created.
+
+    Returns:
+        dict: {metric name: {coffee: value}} with one entry per coffee that has
+        orders. The values match the equivalent Coffee methods and
+        Customer.most_aficionado.
+
+    Raises:
+        ValueError: If an unknown metric is requested.
+    """
+    # Validate the requested metrics before reading any orders
+    requested = set(metrics)
+    unknown = requested - set(METRICS)
+    if unknown:
+        raise ValueError(f"unknown metrics: {sorted(unknown)}")
+    # Spending per customer is only tracked when a metric needs it
+    track_customers = bool(requested & {MOST_AFICIONADO, DISTINCT_CUSTOMERS})
+
+    orders, rollups = _resolve_source(source)
+    totals = {}
+    # Fold in the rollups of compacted orders first, as Customer.most_aficionado
+    # does, so ties break in favour of the customer who ordered first
+    for rollup in rollups:
+        coffee_totals = totals.get(rollup.coffee)
+        if coffee_totals is None:
+            coffee_totals = totals[rollup.coffee] = _CoffeeTotals()
+        coffee_totals.total.add_rollup(rollup)
+        if track_customers:
+            spending = coffee_totals.spending
+            customer_total = spending.get(rollup.customer)
+            if customer_total is None:
+                customer_total = spending[rollup.customer] = SpendTotal()
+            customer_total.add_rollup(rollup)
+    # Then a single pass over the raw orders
+    for order in orders:
+        coffee_totals = totals.get(order.coffee)
+        if coffee_totals is None:
+            coffee_totals = totals[order.coffee] = _CoffeeTotals()
+        coffee_totals.total.add_order(order)
+        if track_customers:
+            spending = coffee_totals.spending
+            customer_total = spending.get(order.customer)
+            if customer_total is None:
+                customer_total = spending[order.customer] = SpendTotal()
+            customer_total.add_order(order)
+
+    # Build the result structure for the requested metrics only
+    results = {metric: {} for metric in requested}
+    for coffee, coffee_totals in totals.items():
+        total = coffee_totals.total
+        if NUM_ORDERS in requested:
+            results[NUM_ORDERS][coffee] = total.count
+        if TOTAL_PRICE_CENTS in requested:
+            results[TOTAL_PRICE_CENTS][coffee] = total.total_cents()
+        if AVERAGE_PRICE in requested:
+            results[AVERAGE_PRICE][coffee] = total.amount / total.count
+        if MOST_AFICIONADO in requested:
+            results[MOST_AFICIONADO][coffee] = top_spender(coffee_totals.spending)
+        if DISTINCT_CUSTOMERS in requested:
+            results[DISTINCT_CUSTOMERS][coffee] = len(coffee_totals.spending)
+    return results
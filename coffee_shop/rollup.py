@@ -0,0 +1,181 @@
+# Enable forward references for type hints
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+# Import Customer to reach the process-wide order registry
+from customer import Customer
+
+# Use TYPE_CHECKING to avoid circular imports at runtime
+# These classes are only imported for type hinting, not actual execution
+if TYPE_CHECKING:
+    from coffee import Coffee
+    from order import Order
+    from shop import Shop
+
+
+# Default rollup period: one day, in seconds
+DAY = 86400
+
+
+class OrderRollup(NamedTuple):
+    """
+    Summary of the compacted orders of one (customer, coffee) pair in one period.
+
+    Rollups are immutable; compacting more orders into the same period
+    produces a new rollup instead of changing the existing one.
+
+    Attributes:
+        period_start (float): Unix timestamp at which the period starts.
+        customer (Customer): The customer who placed the orders.
+        coffee (Coffee): The coffee that was ordered.
+        count (int): Number of orders summarized.
+        spend_cents (int): Total price of the orders, in cents.
+        spend (float): Total price of the orders, as a float.
+        min_price_cents (int): Cheapest order price, in cents.
+        max_price_cents (int): Most expensive order price, in cents.
+        exact (bool): True if every order was cents-priced, so spend_cents
+            is exact; otherwise spend is the total to use (see order.SpendTotal).
+    """
+
+    period_start: float
+    customer: Customer
+    coffee: Coffee
+    count: int
+    spend_cents: int
+    spend: float
+    min_price_cents: int
+    max_price_cents: int
+    exact: bool = True
+
+    @classmethod
+    def from_order(cls, order: Order, period_start: float) -> OrderRollup:
+        """Return the rollup of a single order."""
+        return cls(period_start, order.customer, order.coffee, 1, order.price_cents,
+                   order.price, order.price_cents, order.price_cents, order.cents_priced)
+
+    def merge(self, other: OrderRollup) -> OrderRollup:
+        """Return a rollup combining this one with another for the same pair and period."""
+        return self._replace(
+            count=self.count + other.count,
+            spend_cents=self.spend_cents + other.spend_cents,
+            spend=self.spend + other.spend,
+            min_price_cents=min(self.min_price_cents, other.min_price_cents),
+            max_price_cents=max(self.max_price_cents, other.max_price_cents),
+            exact=self.exact and other.exact,
+        )
+
+    @property
+    def min_price(self) -> float:
+        """Get the cheapest order price as a float."""
+        return self.min_price_cents / 100
+
+    @property
+    def max_price(self) -> float:
+        """Get the most expensive order price as a float."""
+        return self.max_price_cents / 100
+
+
+def _compact(orders: list[Order], rollups: dict, cutoff: float,
+             period_seconds: float) -> tuple[list[Order], dict, int]:
+    """
+    Fold orders older than cutoff into rollups. (Internal function)
+
+    Lists and dictionaries are never modified in place: customers and coffees
+    get new ones, so anything still holding the old ones sees unchanged data.
+
+    Returns:
+        tuple: (remaining orders, new registry rollups, number of orders compacted)
+    """
+    # Oldest first (stable for equal timestamps), so new rollup keys are
+    # inserted in order of their first order and ties break as before compaction
+    old = sorted((order for order in orders if order.created_at < cutoff),
+                 key=lambda order: order.created_at)
+    if not old:
+        return orders, rollups, 0
+    old_ids = {id(order) for order in old}
+
+    # Merge every old order into the rollup of its (period, customer, coffee)
+    new_rollups = dict(rollups)
+    # A dictionary rather than a set keeps the keys in that order
+    changed = {}
+    for order in old:
+        period_start = order.created_at // period_seconds * period_seconds
+        key = (period_start, order.customer, order.coffee)
+        single = OrderRollup.from_order(order, period_start)
+        new_rollups[key] = new_rollups[key].merge(single) if key in new_rollups else single
+        changed[key] = None
+
+    # Build the new per-customer and per-coffee rollup dictionaries
+    customer_rollups = {}
+    coffee_rollups = {}
+    for key in changed:
+        period_start, customer, coffee = key
+        if customer not in customer_rollups:
+            customer_rollups[customer] = dict(customer._rollups)
+        customer_rollups[customer][(period_start, coffee)] = new_rollups[key]
+        if coffee not in coffee_rollups:
+            coffee_rollups[coffee] = dict(coffee._rollups)
+        coffee_rollups[coffee][(period_start, customer)] = new_rollups[key]
+
+    # Swap in the new rollups and the remaining raw orders
+    for item, item_rollups in list(customer_rollups.items()) + list(coffee_rollups.items()):
+        item._rollups = item_rollups
+        item._orders = [order for order in item._orders if id(order) not in old_ids]
+
+    remaining = [order for order in orders if id(order) not in old_ids]
+    return remaining, new_rollups, len(old)
+
+
+def compact_orders(cutoff: float, *, period_seconds: float = DAY, shop: Shop | None = None) -> int:
+    """
+    Compact orders placed before cutoff into per-period rollups.
+
+    Each (customer, coffee) pair gets one OrderRollup per period of
+    period_seconds (aligned to the Unix epoch) holding count, spend, min and
+    max. Coffee.num_orders, average_price, customers, Customer.coffees and
+    most_aficionado merge the rollups with the remaining raw orders, so their
+    answers do not change; orders() only returns the raw orders. Rollups are
+    kept in order of their first order and are folded in before the (newer)
+    raw orders, so most_aficionado still breaks ties in favour of the
+    customer who ordered first.
+
+    Without a shop the process-wide Customer._all_orders is compacted; that
+    must not run concurrently with create_order or with reads of the
+    aggregates. A shop is compacted under its own lock, and Coffee and
+    Customer read their orders and rollups together under the same lock, so
+    their answers stay consistent while a shop is being compacted.
+
+    Args:
+        cutoff (float): Unix timestamp; orders created strictly before it are compacted.
+        period_seconds (float): Length of a rollup period (default one day).
+        shop (Shop | None): The shop to compact, or None for the global registry.
+
+    Returns:
+        int: Number of orders compacted.
+
+    Raises:
+        TypeError: If cutoff or period_seconds is not a number.
+        ValueError: If period_seconds is not positive.
+    """
+    # Validate the arguments before touching any data
+    if not isinstance(cutoff, (int, float)):
+        raise TypeError("cutoff must be a number")
+    if not isinstance(period_seconds, (int, float)):
+        raise TypeError("period_seconds must be a number")
+    if period_seconds <= 0:
+        raise ValueError("period_seconds must be positive")
+
+    if shop is None:
+        remaining, rollups, count = _compact(Customer._all_orders, Customer._all_rollups,
+                                             cutoff, period_seconds)
+        Customer._all_orders = remaining
+        Customer._all_rollups = rollups
+        return count
+
+    # Hold the shop lock so no order is added while lists are being swapped
+    with shop._lock:
+        remaining, rollups, count = _compact(shop._orders, shop._rollups, cutoff, period_seconds)
+        shop._orders = remaining
+        shop._rollups = rollups
+    return count
@@ -0,0 +1,197 @@
+# Enable forward references for type hints
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+# Import Customer and Coffee to create instances owned by a shop
+from customer import Customer
+from coffee import Coffee
+# Import the compaction entry point and rollup types
+from rollup import DAY, OrderRollup, compact_orders
+# Import the point-in-time snapshot support
+from snapshot import Snapshot, snapshot as take_snapshot
+
+# Use TYPE_CHECKING to avoid circular imports at runtime
+# Order and OrderEventStream are only imported for type hinting
+if TYPE_CHECKING:
+    from order import Order
+    from events import OrderEventStream
+
+
+class _ClosedShop:
+    """Stand-in owner for customers and coffees of a cleared shop. (Internal class)"""
+
+    name = "closed shop"
+
+    def _record(self, order: Order) -> None:
+        """Reject orders from objects whose shop was cleared. (Internal method)"""
+        raise ValueError("the shop was cleared; its customers and coffees can no longer order")
+
+    def _register_customer(self, customer: Customer) -> None:
+        """Reject new customers for a cleared shop. (Internal method)"""
+        raise ValueError("the shop was cleared; add customers to the shop itself")
+
+    def _register_coffee(self, coffee: Coffee) -> None:
+        """Reject new coffees for a cleared shop. (Internal method)"""
+        raise ValueError("the shop was cleared; add coffees to the shop itself")
+
+
+# Shared sentinel assigned as _shop by Shop.clear()
+_CLOSED_SHOP = _ClosedShop()
+
+
+class Shop:
+    """
+    Shop class is an isolated coffee shop owning its customers, coffees and orders.
+
+    Customers and coffees created through a shop record their orders in the
+    shop instead of the process-wide Customer._all_orders, so many shops can
+    run side by side in one process. Each shop has its own lock, and dropping
+    the last reference to a shop (or calling clear()) releases all its data.
+
+    Attributes:
+        name (str): The name of the shop.
+        event_stream (OrderEventStream | None): Stream notified of this shop's new orders.
+        _customers (list): Customers registered in this shop.
+        _coffees (list): Coffees on this shop's menu.
+        _orders (list): All (not compacted) orders placed in this shop.
+        _rollups (dict): Rollups of compacted orders, keyed by
+            (period_start, customer, coffee).
+    """
+
+    def __init__(self, name: str = "Coffee Shop", event_stream: OrderEventStream | None = None):
+        """
+        Initialize an empty Shop.
+
+        Args:
+            name (str): The name of the shop.
+            event_stream (OrderEventStream | None): Optional stream for new orders.
+        """
+        # Check the shop name is a non-empty string
+        if not isinstance(name, str):
+            raise TypeError("Shop name must be a string.")
+        if not name:
+            raise ValueError("Shop name must not be empty.")
+        self.name = name
+        self.event_stream = event_stream
+        # Per-shop state; nothing here is shared with other shops
+        self._customers = []
+        self._coffees = []
+        self._orders = []
+        self._rollups = {}
+        # Serializes writers of this shop only
+        self._lock = threading.Lock()
+
+    def add_customer(self, name: str) -> Customer:
+        """Create a Customer that belongs to this shop and return it."""
+        # The constructor registers the customer (see _register_customer)
+        return Customer(name, shop=self)
+
+    def add_coffee(self, name: str) -> Coffee:
+        """Create a Coffee on this shop's menu and return it."""
+        # The constructor registers the coffee (see _register_coffee)
+        return Coffee(name, shop=self)
+
+    def _register_customer(self, customer: Customer) -> None:
+        """Add a customer built with shop=self to this shop. (Internal method)"""
+        with self._lock:
+            self._customers.append(customer)
+
+    def _register_coffee(self, coffee: Coffee) -> None:
+        """Add a coffee built with shop=self to this shop's menu. (Internal method)"""
+        with self._lock:
+            self._coffees.append(coffee)
+
+    def customers(self) -> list[Customer]:
+        """Return a copy of the list of customers in this shop."""
+        return self._customers.copy()
+
+    def coffees(self) -> list[Coffee]:
+        """Return a copy of the list of coffees in this shop."""
+        return self._coffees.copy()
+
+    def orders(self) -> list[Order]:
+        """Return a copy of the list of orders placed in this shop."""
+        return self._orders.copy()
+
+    def rollups(self) -> list[OrderRollup]:
+        """Return a list of the rollups of this shop's compacted orders."""
+        return list(self._rollups.values())
+
+    def compact(self, cutoff: float, period_seconds: float = DAY) -> int:
+        """
+        Compact this shop's orders placed before cutoff into rollups.
+
+        See rollup.compact_orders for details.
+
+        Returns:
+            int: Number of orders compacted.
+        """
+        return compact_orders(cutoff, period_seconds=period_seconds, shop=self)
+
+    def snapshot(self) -> Snapshot:
+        """
+        Return a consistent, read-only point-in-time view of this shop.
+
+        Reports can run against the snapshot while orders keep arriving;
+        see snapshot.Snapshot for the queries it supports.
+        """
+        return take_snapshot(self)
+
+    def _check_owned(self, item) -> None:
+        """Raise ValueError if a customer or coffee belongs to another shop. (Internal method)"""
+        if getattr(item, '_shop', None) is not self:
+            raise ValueError(f"{item.name} does not belong to shop {self.name}")
+
+    def create_order(self, customer: Customer, coffee: Coffee, price: float | None = None,
+                     *, price_cents: int | None = None,
+                     created_at: float | None = None) -> Order:
+        """
+        Create an order in this shop; see Customer.create_order.
+
+        Raises:
+            ValueError: If the customer or coffee belongs to another shop.
+        """
+        self._check_owned(customer)
+        return customer.create_order(coffee, price, price_cents=price_cents,
+                                     created_at=created_at)
+
+    def _record(self, order: Order) -> None:
+        """Store a new order in the shop and its indexes. (Internal method)"""
+        # Update all three order lists together so readers see consistent data
+        with self._lock:
+            order.customer._add_order(order)
+            self._orders.append(order)
+            order.coffee._add_order(order)
+        # Publish outside the lock; the stream has its own backpressure
+        if self.event_stream is not None:
+            self.event_stream.publish(order)
+
+    def most_aficionado(self, coffee: Coffee) -> Customer | None:
+        """
+        Find the customer of this shop who spent the most on a given coffee.
+
+        Raises:
+            ValueError: If the coffee belongs to another shop.
+        """
+        self._check_owned(coffee)
+        return Customer.most_aficionado(coffee)
+
+    def clear(self) -> None:
+        """
+        Forget all customers, coffees and orders of this shop.
+
+        Customers and coffees of the shop (from add_customer and add_coffee
+        or built with shop=) are detached: any that are still referenced
+        elsewhere raise ValueError if used to create orders.
+        New ones can be added with add_customer and add_coffee.
+        """
+        with self._lock:
+            # Detach existing objects so they cannot write into the cleared shop
+            for item in self._customers + self._coffees:
+                item._shop = _CLOSED_SHOP
+            self._customers = []
+            self._coffees = []
+            self._orders = []
+            self._rollups = {}
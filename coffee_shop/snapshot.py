@@ -0,0 +1,152 @@
+# Enable forward references for type hints
+from __future__ import annotations
+
+from itertools import islice
+from typing import TYPE_CHECKING, Iterator
+
+# Import Customer to reach the process-wide order registry
+from customer import Customer
+# Import the spend accumulator so totals match Coffee and Customer
+from order import SpendTotal, top_spender
+
+# Use TYPE_CHECKING to avoid circular imports at runtime
+# These classes are only imported for type hinting, not actual execution
+if TYPE_CHECKING:
+    from coffee import Coffee
+    from order import Order
+    from shop import Shop
+
+
+class Snapshot:
+    """
+    Snapshot is a read-only, point-in-time view of an order registry.
+
+    Order lists only ever grow by appending, and compaction swaps in new
+    lists and rollup dictionaries instead of editing them, so a snapshot
+    only needs a reference to the current list, its length and the current
+    rollups. Taking one is O(1); the per-coffee index is built on the first
+    query. Orders created after the snapshot are never visible through it,
+    and writers are never blocked by reports running against it.
+    """
+
+    def __init__(self, orders: list[Order], length: int, rollups: dict):
+        """
+        Initialize a Snapshot over the first length entries of orders.
+
+        Use Shop.snapshot() or snapshot.snapshot() rather than calling this directly.
+        """
+        self._orders = orders
+        self._length = length
+        self._rollups = rollups
+        # Lazily built indexes: coffee -> orders and coffee -> rollups
+        self._orders_by_coffee = None
+        self._rollups_by_coffee = None
+
+    def orders(self, coffee: Coffee | None = None) -> list[Order]:
+        """Return the raw orders visible in the snapshot, optionally for one coffee."""
+        if coffee is None:
+            return list(islice(self._orders, self._length))
+        return list(self._coffee_orders(coffee))
+
+    def rollups(self) -> list:
+        """Return the rollups of compacted orders visible in the snapshot."""
+        return list(self._rollups.values())
+
+    def iter_orders(self) -> Iterator[Order]:
+        """Iterate over the raw orders visible in the snapshot without copying them."""
+        return islice(self._orders, self._length)
+
+    def iter_rollups(self) -> Iterator:
+        """Iterate over the snapshot's rollups without copying them."""
+        # The rollup dictionary is replaced, never edited, so iterating it is safe
+        return iter(self._rollups.values())
+
+    def _build_index(self) -> None:
+        """Group the frozen orders and rollups by coffee. (Internal method)"""
+        orders_by_coffee = {}
+        for order in islice(self._orders, self._length):
+            orders_by_coffee.setdefault(order.coffee, []).append(order)
+        rollups_by_coffee = {}
+        for rollup in self._rollups.values():
+            rollups_by_coffee.setdefault(rollup.coffee, []).append(rollup)
+        # Publish the rollup index last; it is the "index is ready" flag
+        self._orders_by_coffee = orders_by_coffee
+        self._rollups_by_coffee = rollups_by_coffee
+
+    def _coffee_orders(self, coffee: Coffee) -> list[Order]:
+        """Return the snapshot's raw orders for a coffee. (Internal method)"""
+        if self._rollups_by_coffee is None:
+            self._build_index()
+        return self._orders_by_coffee.get(coffee, [])
+
+    def _coffee_rollups(self, coffee: Coffee) -> list:
+        """Return the snapshot's rollups for a coffee. (Internal method)"""
+        if self._rollups_by_coffee is None:
+            self._build_index()
+        return self._rollups_by_coffee.get(coffee, [])
+
+    def coffees(self) -> list[Coffee]:
+        """Return the coffees that have orders in the snapshot."""
+        if self._rollups_by_coffee is None:
+            self._build_index()
+        return list(set(self._orders_by_coffee) | set(self._rollups_by_coffee))
+
+    def customers(self, coffee: Coffee) -> list[Customer]:
+        """Return the unique customers who ordered a coffee, as of the snapshot."""
+        customers_set = {order.customer for order in self._coffee_orders(coffee)}
+        customers_set.update(rollup.customer for rollup in self._coffee_rollups(coffee))
+        return list(customers_set)
+
+    def num_orders(self, coffee: Coffee) -> int:
+        """Return how many times a coffee had been ordered, as of the snapshot."""
+        return (len(self._coffee_orders(coffee))
+                + sum(rollup.count for rollup in self._coffee_rollups(coffee)))
+
+    def total_price_cents(self, coffee: Coffee) -> int:
+        """Return the total spent on a coffee in cents, as of the snapshot."""
+        total = SpendTotal()
+        for rollup in self._coffee_rollups(coffee):
+            total.add_rollup(rollup)
+        for order in self._coffee_orders(coffee):
+            total.add_order(order)
+        return total.total_cents()
+
+    def average_price(self, coffee: Coffee) -> float:
+        """Return the average price of a coffee, as of the snapshot."""
+        count = self.num_orders(coffee)
+        # Avoid division by zero for coffees without orders
+        if not count:
+            return 0.0
+        total = sum(rollup.spend for rollup in self._coffee_rollups(coffee))
+        total += sum(order.price for order in self._coffee_orders(coffee))
+        return total / count
+
+    def most_aficionado(self, coffee: Coffee) -> Customer | None:
+        """Return the customer who had spent the most on a coffee, as of the snapshot."""
+        spending = {}
+        # Rollups first, as in Customer.most_aficionado, so ties break the same way
+        for rollup in self._coffee_rollups(coffee):
+            if rollup.customer not in spending:
+                spending[rollup.customer] = SpendTotal()
+            spending[rollup.customer].add_rollup(rollup)
+        for order in self._coffee_orders(coffee):
+            if order.customer not in spending:
+                spending[order.customer] = SpendTotal()
+            spending[order.customer].add_order(order)
+        # None when there are no orders for this coffee in the snapshot
+        return top_spender(spending)
+
+
+def snapshot(shop: Shop | None = None) -> Snapshot:
+    """
+    Take a point-in-time snapshot of a shop, or of the global registry.
+
+    For a shop the shop lock is held only long enough to read three
+    references. Without a shop, Customer._all_orders is used; compacting
+    the global registry while taking a snapshot is not supported.
+    """
+    if shop is None:
+        orders = Customer._all_orders
+        return Snapshot(orders, len(orders), Customer._all_rollups)
+    with shop._lock:
+        return Snapshot(shop._orders, len(shop._orders), shop._rollups)
@@ -4,6 +4,7 @@ sys.path.insert(0, '..')
 import pytest
 from coffee import Coffee
 from customer import Customer
+from hll import HyperLogLog
 
 
 class TestCoffeeInitialization:
@@ -145,3 +146,102 @@ class TestCoffeeAveragePrice:
         
         average = coffee.average_price()
         assert abs(average - 2.5) < 0.01
+
+
+class TestCoffeeDistinctCustomers:
+    """Test Coffee distinct_customers_estimate method."""
+
+    def test_estimate_without_sketch_is_exact(self):
+        """Test that the estimate is exact when no sketch is tracked."""
+        coffee = Coffee("Cold Brew")
+        Customer("Kate").create_order(coffee, 3.0)
+        Customer("Liam").create_order(coffee, 3.0)
+
+        result = coffee.distinct_customers_estimate()
+        assert result.estimate == 2
+        assert result.relative_error == 0.0
+        assert coffee.distinct_sketch() is None
+
+    def test_estimate_counts_names_with_or_without_sketch(self):
+        """Test that the exact fallback identifies customers by name, like the sketch."""
+        coffee = Coffee("Macchiato")
+        Customer("Rita").create_order(coffee, 3.0)
+        Customer("Rita").create_order(coffee, 3.0)
+        Customer("Sam").create_order(coffee, 3.0)
+
+        assert len(coffee.customers()) == 3
+        assert coffee.distinct_customers_estimate().estimate == 2
+        coffee.track_distinct_customers()
+        assert coffee.distinct_customers_estimate().estimate == 2
+
+    def test_sketch_backfills_and_updates(self):
+        """Test that the sketch counts existing and new orders."""
+        coffee = Coffee("Red Eye")
+        customer = Customer("Mia")
+        customer.create_order(coffee, 2.0)
+        customer.create_order(coffee, 2.0)
+
+        coffee.track_distinct_customers()
+        assert coffee.distinct_customers_estimate().estimate == 1
+
+        Customer("Noah").create_order(coffee, 2.0)
+        result = coffee.distinct_customers_estimate()
+        assert result.estimate == 2
+        assert result.low <= 2 <= result.high
+
+    def test_sketches_merge_across_coffees(self):
+        """Test that sketches from different coffees can be merged."""
+        latte = Coffee("Latte")
+        mocha = Coffee("Mocha")
+        latte.track_distinct_customers()
+        mocha.track_distinct_customers()
+        shared = Customer("Olga")
+        shared.create_order(latte, 3.0)
+        shared.create_order(mocha, 3.0)
+        Customer("Paul").create_order(mocha, 3.0)
+
+        merged = latte.distinct_sketch().merge(mocha.distinct_sketch())
+        assert merged.cardinality() == 2
+
+
+class TestCoffeePriceCents:
+    """Test the integer-cents aggregates of Coffee."""
+
+    def test_total_price_cents_is_exact(self):
+        """Test that cents totals do not accumulate floating-point error."""
+        coffee = Coffee("Doppio")
+        customer = Customer("Quinn")
+        for _ in range(10):
+            customer.create_order(coffee, 1.1)
+
+        assert coffee.total_price_cents() == 1100
+        assert coffee.average_price_cents() == 110.0
+
+    def test_price_cents_array(self):
+        """Test that prices are exported as a compact integer array."""
+        coffee = Coffee("Gibraltar")
+        customer = Customer("Rosa")
+        customer.create_order(coffee, price_cents=250)
+        customer.create_order(coffee, 3.75)
+
+        prices = coffee.price_cents_array()
+        assert prices.typecode == 'H'
+        assert list(prices) == [250, 375]
+
+    def test_average_price_cents_empty(self):
+        """Test average_price_cents for coffee with no orders."""
+        assert Coffee("Breve").average_price_cents() == 0.0
+
+    def test_serialized_sketches_merge_by_name(self):
+        """Test that sketches built from separate objects agree on customer names."""
+        store1 = Coffee("Latte")
+        store2 = Coffee("Latte")
+        store1.track_distinct_customers()
+        store2.track_distinct_customers()
+        # Same customer name in two stores, represented by different objects
+        Customer("Rita").create_order(store1, 3.0)
+        Customer("Rita").create_order(store2, 3.0)
+        Customer("Sam").create_order(store2, 3.0)
+
+        shipped = HyperLogLog.from_bytes(store2.distinct_sketch().to_bytes())
+        assert store1.distinct_sketch().merge(shipped).cardinality() == 2
@@ -144,3 +144,75 @@ class TestMostAficionado:
         
         result = Customer.most_aficionado(coffee)
         assert result in [customer1, customer2]
+
+    def test_most_aficionado_exact_cents(self):
+        """Test that small price differences are compared exactly in cents."""
+        coffee = Coffee("Vienna")
+
+        customer1 = Customer("Mona")
+        customer2 = Customer("Ned")
+
+        # Ten orders of 1.10 equal exactly 11.00 in cents
+        for _ in range(10):
+            customer1.create_order(coffee, price_cents=110)
+        customer2.create_order(coffee, price_cents=1000)
+        customer2.create_order(coffee, price_cents=101)
+
+        result = Customer.most_aficionado(coffee)
+        assert result == customer2
+
+    def test_most_aficionado_sub_cent_float_prices(self):
+        """Test that float prices are not rounded to cents before ranking."""
+        coffee = Coffee("Cubano")
+        customer1 = Customer("Ada")
+        customer2 = Customer("Ben")
+
+        # 3 x 1.005 = 3.015 beats 3.01, although both round to 301 cents per order
+        for _ in range(3):
+            customer1.create_order(coffee, 1.005)
+        customer2.create_order(coffee, 3.01)
+
+        assert Customer.most_aficionado(coffee) == customer1
+        assert customer1.spend_profile().total_spend == 1.005 + 1.005 + 1.005
+        assert coffee.total_price_cents() == round((1.005 + 1.005 + 1.005 + 3.01) * 100)
+
+
+class TestCustomerSpendProfile:
+    """Test the incremental spend_profile method."""
+
+    def test_spend_profile_empty(self):
+        """Test the profile of a customer without orders."""
+        profile = Customer("Olga").spend_profile()
+        assert profile.order_count == 0
+        assert profile.total_spend == 0.0
+        assert profile.average_ticket == 0.0
+        assert profile.favourite_coffee is None
+
+    def test_spend_profile_totals(self):
+        """Test that totals and average ticket follow create_order."""
+        customer = Customer("Paul")
+        latte = Coffee("Latte")
+        mocha = Coffee("Mocha")
+        customer.create_order(latte, 3.0)
+        customer.create_order(mocha, 4.5)
+        customer.create_order(latte, 3.0)
+
+        profile = customer.spend_profile()
+        assert profile.order_count == 3
+        assert profile.total_spend_cents == 1050
+        assert profile.total_spend == 10.5
+        assert profile.average_ticket == 3.5
+        assert profile.favourite_coffee == latte
+        assert profile.favourite_count == 2
+
+    def test_favourite_changes_when_overtaken(self):
+        """Test that the favourite moves only when another coffee overtakes it."""
+        customer = Customer("Quinn")
+        latte = Coffee("Latte")
+        mocha = Coffee("Mocha")
+        customer.create_order(latte, 3.0)
+        customer.create_order(mocha, 3.0)
+        assert customer.spend_profile().favourite_coffee == latte  # tie keeps first
+
+        customer.create_order(mocha, 3.0)
+        assert customer.spend_profile().favourite_coffee == mocha
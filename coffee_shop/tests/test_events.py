@@ -0,0 +1,300 @@
+import sys
+sys.path.insert(0, '..')
+
+import asyncio
+import threading
+
+import pytest
+from coffee import Coffee
+from customer import Customer
+from events import OrderEventStream
+
+
+@pytest.fixture
+def stream():
+    """Install a fresh event stream on Customer and remove it afterwards."""
+    stream = OrderEventStream(maxsize=4, batch_size=2, drop_policy="block", block_timeout=2)
+    Customer.set_event_stream(stream)
+    yield stream
+    Customer.set_event_stream(None)
+
+
+class TestOrderEventStreamInitialization:
+    """Test OrderEventStream configuration validation."""
+
+    def test_invalid_maxsize(self):
+        """Test that maxsize must be positive."""
+        with pytest.raises(ValueError):
+            OrderEventStream(maxsize=0)
+
+    def test_invalid_batch_size(self):
+        """Test that batch_size must be positive."""
+        with pytest.raises(ValueError):
+            OrderEventStream(batch_size=0)
+
+    def test_invalid_drop_policy(self):
+        """Test that an unknown drop policy is rejected."""
+        with pytest.raises(ValueError):
+            OrderEventStream(drop_policy="ignore")
+
+    def test_set_event_stream_validation(self):
+        """Test that Customer only accepts stream-like objects."""
+        with pytest.raises(TypeError):
+            Customer.set_event_stream("not a stream")
+
+
+class TestOrderEventPublishing:
+    """Test that create_order publishes events."""
+
+    def test_create_order_publishes_event(self, stream):
+        """Test that a new order is queued but not yet delivered."""
+        received = []
+        stream.subscribe(received.extend)
+        order = Customer("Alice").create_order(Coffee("Espresso"), 2.5)
+
+        assert received == []  # Nothing runs inline in create_order
+        assert stream.metrics()["depth"] == 1
+        assert stream.drain() == 1
+        assert [event.order for event in received] == [order]
+        assert received[0].sequence == 1
+
+    def test_batches_respect_batch_size(self, stream):
+        """Test that subscribers receive batches of at most batch_size events."""
+        batches = []
+        stream.subscribe(batches.append)
+        customer = Customer("Bob")
+        coffee = Coffee("Latte")
+        for _ in range(3):
+            customer.create_order(coffee, 3.0)
+
+        stream.drain()
+        assert [len(batch) for batch in batches] == [2, 1]
+
+    def test_failing_subscriber_does_not_block_others(self, stream):
+        """Test that an exception in one subscriber is counted and isolated."""
+        received = []
+
+        def broken(batch):
+            raise RuntimeError("boom")
+
+        stream.subscribe(broken)
+        stream.subscribe(received.extend)
+        Customer("Carol").create_order(Coffee("Mocha"), 4.0)
+        stream.drain()
+
+        assert len(received) == 1
+        assert stream.metrics()["errors"] == 1
+
+
+class TestOrderEventBackpressure:
+    """Test the drop policies of a full stream."""
+
+    def test_drop_newest(self):
+        """Test that drop_newest discards the incoming event."""
+        stream = OrderEventStream(maxsize=2, drop_policy="drop_newest")
+        orders = [Customer("Dan").create_order(Coffee("Cortado"), 2.0) for _ in range(3)]
+        results = [stream.publish(order) for order in orders]
+
+        assert results == [True, True, False]
+        received = []
+        stream.subscribe(received.extend)
+        stream.drain()
+        assert [event.order for event in received] == orders[:2]
+        assert stream.metrics()["dropped"] == 1
+
+    def test_drop_oldest(self):
+        """Test that drop_oldest evicts the oldest queued event."""
+        stream = OrderEventStream(maxsize=2, drop_policy="drop_oldest")
+        orders = [Customer("Erin").create_order(Coffee("Lungo"), 2.0) for _ in range(3)]
+        for order in orders:
+            assert stream.publish(order)
+
+        received = []
+        stream.subscribe(received.extend)
+        stream.drain()
+        assert [event.order for event in received] == orders[1:]
+        assert stream.metrics()["dropped"] == 1
+
+    def test_default_policy_never_blocks(self):
+        """Test that the default policy drops instead of blocking create_order."""
+        stream = OrderEventStream(maxsize=1)
+        assert stream.drop_policy == "drop_oldest"
+        order = Customer("Ivy").create_order(Coffee("Latte"), 2.0)
+
+        assert stream.publish(order)
+        assert stream.publish(order)
+        assert stream.metrics()["dropped"] == 1
+
+    def test_consumer_publish_does_not_block(self):
+        """Test that a subscriber publishing into a full blocking stream drops."""
+        stream = OrderEventStream(maxsize=1, drop_policy="block", block_timeout=None)
+        order = Customer("Jill").create_order(Coffee("Mocha"), 2.0)
+        results = []
+
+        def loyalty(batch):
+            # On the first batch, fill the queue and publish again from the consumer thread
+            if not results:
+                results.append(stream.publish(order))
+                results.append(stream.publish(order))
+
+        stream.subscribe(loyalty)
+        stream.publish(order)
+        stream.start(poll_interval=0.01)
+        assert stream.stop(timeout=2)
+
+        assert results == [True, False]
+        assert stream.metrics()["dropped"] == 1
+
+    def test_block_timeout_drops(self):
+        """Test that a blocked publish gives up after block_timeout."""
+        stream = OrderEventStream(maxsize=1, drop_policy="block", block_timeout=0.01)
+        order = Customer("Finn").create_order(Coffee("Ristretto"), 2.0)
+
+        assert stream.publish(order)
+        assert not stream.publish(order)
+        assert stream.metrics()["dropped"] == 1
+
+
+class TestOrderEventWorkers:
+    """Test background delivery through a thread or asyncio task."""
+
+    def test_worker_thread_delivers(self, stream):
+        """Test that the worker thread delivers events and drains on stop."""
+        received = []
+        done = threading.Event()
+
+        def subscriber(batch):
+            received.extend(batch)
+            if len(received) == 5:
+                done.set()
+
+        stream.subscribe(subscriber)
+        stream.start(poll_interval=0.01)
+        customer = Customer("Gina")
+        coffee = Coffee("Americano")
+        for _ in range(5):
+            customer.create_order(coffee, 2.0)
+
+        assert done.wait(2)
+        stream.stop()
+        metrics = stream.metrics()
+        assert metrics["delivered"] == 5
+        assert metrics["depth"] == 0
+        assert metrics["max_depth"] <= 4
+
+    def test_asyncio_task_delivers(self, stream):
+        """Test that run_async awaits coroutine subscribers."""
+        received = []
+
+        async def subscriber(batch):
+            received.extend(batch)
+
+        async def scenario():
+            stream.subscribe(subscriber)
+            task = asyncio.create_task(stream.run_async(poll_interval=0.001))
+            Customer("Hank").create_order(Coffee("Affogato"), 5.0)
+            while not received:
+                await asyncio.sleep(0.001)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(scenario())
+        assert len(received) == 1
+
+    def test_asyncio_cancel_awaits_pending_events(self, stream):
+        """Test that events queued at cancellation reach coroutine subscribers."""
+        received = []
+
+        async def subscriber(batch):
+            await asyncio.sleep(0)
+            received.extend(batch)
+
+        async def scenario():
+            stream.subscribe(subscriber)
+            task = asyncio.create_task(stream.run_async(poll_interval=10))
+            await asyncio.sleep(0)  # the task is now sleeping on an empty queue
+            customer = Customer("Lena")
+            coffee = Coffee("Latte")
+            for _ in range(3):
+                customer.create_order(coffee, 3.0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(scenario())
+        assert len(received) == 3
+        assert stream.metrics()["delivered"] == 3
+
+    def test_asyncio_cancel_during_slow_subscriber(self, stream):
+        """Test that cancelling mid-batch still delivers the batch to the others."""
+        started = []
+        received = []
+
+        async def slow(batch):
+            started.append(batch)
+            if len(started) == 1:
+                await asyncio.sleep(10)
+
+        async def fast(batch):
+            received.extend(batch)
+
+        async def scenario():
+            stream.subscribe(slow)
+            stream.subscribe(fast)
+            customer = Customer("Omar")
+            coffee = Coffee("Latte")
+            for _ in range(3):
+                customer.create_order(coffee, 3.0)
+            task = asyncio.create_task(stream.run_async(poll_interval=0.001))
+            while not started:
+                await asyncio.sleep(0.001)
+            task.cancel()  # cancelled while the slow subscriber awaits the first batch
+            with pytest.raises(asyncio.CancelledError):
+                await asyncio.wait_for(task, timeout=2)
+
+        asyncio.run(scenario())
+        metrics = stream.metrics()
+        # The in-flight batch and the queued one reached the fast subscriber
+        assert len(received) == 3
+        assert metrics["delivered"] == 3
+        assert metrics["dropped"] == 0
+        assert metrics["depth"] == 0
+        assert metrics["errors"] == 1
+
+    def test_sync_drain_skips_coroutine_subscribers(self, stream):
+        """Test that drain() does not call coroutine subscribers it cannot await."""
+        received = []
+
+        async def subscriber(batch):
+            received.extend(batch)
+
+        stream.subscribe(subscriber)
+        Customer("Mona").create_order(Coffee("Mocha"), 3.0)
+        stream.drain()
+
+        assert received == []
+        assert stream.metrics()["skipped"] == 1
+
+    def test_asyncio_blocking_stream_does_not_hang(self, stream):
+        """Test that publishing from the event loop thread never blocks it."""
+        stream.maxsize = 2
+        stream.block_timeout = None
+        received = []
+        stream.subscribe(received.extend)
+
+        async def scenario():
+            task = asyncio.create_task(stream.run_async(poll_interval=0.001))
+            await asyncio.sleep(0)  # let the task register as consumer
+            customer = Customer("Kim")
+            coffee = Coffee("Lungo")
+            for _ in range(3):
+                customer.create_order(coffee, 2.0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(asyncio.wait_for(scenario(), timeout=2))
+        metrics = stream.metrics()
+        assert metrics["dropped"] == 1
+        assert len(received) == 2
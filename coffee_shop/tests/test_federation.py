@@ -0,0 +1,131 @@
+import sys
+sys.path.insert(0, '..')
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from federation import AggregateState
+from rollup import DAY
+from shop import Shop
+
+
+# Orders of three stores: (customer name, coffee name, price in cents, day)
+STORE_ORDERS = [
+    [("Alice", "Latte", 350, 0), ("Bob", "Latte", 400, 1), ("Alice", "Mocha", 500, 2)],
+    [("Bob", "Latte", 400, 0), ("Carol", "Mocha", 900, 1), ("Bob", "Mocha", 100, 3)],
+    [("Alice", "Latte", 250, 1), ("Carol", "Latte", 1000, 2), ("Dave", "Espresso", 200, 2)],
+]
+
+
+def build_shop(orders):
+    """Replay (customer, coffee, cents, day) tuples into a new Shop."""
+    shop = Shop()
+    customers = {}
+    coffees = {}
+    for customer_name, coffee_name, cents, day in orders:
+        if customer_name not in customers:
+            customers[customer_name] = shop.add_customer(customer_name)
+        if coffee_name not in coffees:
+            coffees[coffee_name] = shop.add_coffee(coffee_name)
+        shop.create_order(customers[customer_name], coffees[coffee_name],
+                          price_cents=cents, created_at=day * DAY)
+    return shop
+
+
+def run_store(orders):
+    """Run one store in a worker process and export its state as JSON."""
+    shop = build_shop(orders)
+    # Compact part of the history to check rollups are exported too
+    shop.compact(2 * DAY)
+    return AggregateState.from_shop(shop).to_json()
+
+
+class TestAggregateState:
+    """Test building, merging and serializing aggregate states."""
+
+    def test_queries(self):
+        """Test the per-coffee answers of a single store's state."""
+        state = AggregateState.from_shop(build_shop(STORE_ORDERS[0]))
+
+        assert state.coffees() == ["Latte", "Mocha"]
+        assert state.num_orders("Latte") == 2
+        assert state.total_price_cents("Latte") == 750
+        assert state.average_price("Latte") == 3.75
+        assert state.most_aficionado("Latte") == "Bob"
+        assert state.most_aficionado("Flat White") is None
+        assert state.average_price("Flat White") == 0.0
+
+    def test_merge_is_associative_and_commutative(self):
+        """Test that grouping and order of merges do not matter."""
+        a, b, c = (AggregateState.from_shop(build_shop(orders)) for orders in STORE_ORDERS)
+
+        assert a.merge(b).merge(c) == a.merge(b.merge(c))
+        assert a.merge(b, c) == c.merge(b, a)
+        assert AggregateState.merge_all([]) == AggregateState()
+
+    def test_tie_break_is_deterministic(self):
+        """Test that ties are broken by name, independent of merge order."""
+        a = AggregateState.from_shop(build_shop([("Zoe", "Latte", 300, 0)]))
+        b = AggregateState.from_shop(build_shop([("Adam", "Latte", 300, 0)]))
+
+        assert a.merge(b).most_aficionado("Latte") == "Adam"
+        assert b.merge(a).most_aficionado("Latte") == "Adam"
+
+    def test_json_round_trip(self):
+        """Test that a state survives serialization."""
+        state = AggregateState.from_shop(build_shop(STORE_ORDERS[1]))
+        assert AggregateState.from_json(state.to_json()) == state
+
+    def test_version_check(self):
+        """Test that unknown serialized versions are rejected."""
+        with pytest.raises(ValueError):
+            AggregateState.from_dict({"version": 99, "pairs": []})
+
+    def test_same_name_customers_rejected(self):
+        """Test that two distinct customers sharing a name cannot be exported."""
+        shop = Shop()
+        latte = shop.add_coffee("Latte")
+        shop.create_order(shop.add_customer("Alice"), latte, 3.0)
+        shop.create_order(shop.add_customer("Alice"), latte, 4.0)
+
+        with pytest.raises(ValueError):
+            AggregateState.from_shop(shop)
+
+    def test_same_name_in_rollups_rejected(self):
+        """Test that the name check also covers compacted orders."""
+        shop = Shop()
+        latte = shop.add_coffee("Latte")
+        shop.create_order(shop.add_customer("Bob"), latte, 3.0, created_at=0)
+        shop.create_order(shop.add_customer("Bob"), latte, 4.0, created_at=3 * DAY)
+        shop.compact(DAY)
+
+        with pytest.raises(ValueError):
+            AggregateState.from_shop(shop)
+
+    def test_merge_type_check(self):
+        """Test that only states can be merged."""
+        with pytest.raises(TypeError):
+            AggregateState().merge({"pairs": []})
+
+
+class TestFederationAcrossProcesses:
+    """Test chain-wide answers from stores running in separate processes."""
+
+    def test_merged_state_matches_single_replay(self):
+        """Test that merged store states equal replaying every order in one shop."""
+        if "fork" not in multiprocessing.get_all_start_methods():
+            pytest.skip("fork start method is not available")
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=3, mp_context=context) as executor:
+            exported = list(executor.map(run_store, STORE_ORDERS))
+
+        chain = AggregateState.merge_all(AggregateState.from_json(text) for text in exported)
+        everything = build_shop([order for orders in STORE_ORDERS for order in orders])
+        coffees = {coffee.name: coffee for coffee in everything.coffees()}
+
+        assert chain == AggregateState.from_shop(everything)
+        for name, coffee in coffees.items():
+            assert chain.num_orders(name) == coffee.num_orders()
+            assert chain.average_price(name) == pytest.approx(coffee.average_price())
+            assert chain.most_aficionado(name) == everything.most_aficionado(coffee).name
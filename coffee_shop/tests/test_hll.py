@@ -0,0 +1,86 @@
+import sys
+sys.path.insert(0, '..')
+
+import pytest
+from hll import HyperLogLog
+
+
+class TestHyperLogLogInitialization:
+    """Test HyperLogLog construction and validation."""
+
+    def test_default_footprint(self):
+        """Test that the default sketch uses 4096 one-byte registers."""
+        sketch = HyperLogLog()
+        assert sketch.num_registers == 4096
+        assert len(sketch.to_bytes()) == 4097
+
+    def test_precision_validation(self):
+        """Test that precision must be an integer between 4 and 16."""
+        with pytest.raises(TypeError):
+            HyperLogLog(12.0)
+        with pytest.raises(ValueError):
+            HyperLogLog(3)
+        with pytest.raises(ValueError):
+            HyperLogLog(17)
+
+
+class TestHyperLogLogEstimates:
+    """Test cardinality estimates against the documented error bound."""
+
+    def test_empty_sketch(self):
+        """Test that an empty sketch estimates zero."""
+        assert HyperLogLog().cardinality() == 0
+
+    def test_duplicates_ignored(self):
+        """Test that repeated items are counted once."""
+        sketch = HyperLogLog()
+        sketch.update(["alice", "bob", "alice", "bob", "alice"])
+        assert sketch.cardinality() == 2
+
+    @pytest.mark.parametrize("count", [100, 10000, 50000])
+    def test_estimate_within_bound(self, count):
+        """Test that the estimate falls inside its reported interval."""
+        sketch = HyperLogLog(12)
+        sketch.update(range(count))
+        result = sketch.estimate()
+        assert result.low <= count <= result.high
+        assert abs(result.estimate - count) / count < 3 * result.relative_error
+
+
+class TestHyperLogLogMerge:
+    """Test merging and serialization of sketches."""
+
+    def test_merge_equals_union(self):
+        """Test that merging two sketches equals sketching the union."""
+        first = HyperLogLog()
+        second = HyperLogLog()
+        union = HyperLogLog()
+        first.update(range(0, 3000))
+        second.update(range(2000, 5000))
+        union.update(range(0, 5000))
+
+        merged = first.merge(second)
+        assert merged.to_bytes() == union.to_bytes()
+        assert first.cardinality() != merged.cardinality()  # inputs untouched
+
+    def test_merge_precision_mismatch(self):
+        """Test that sketches with different precision cannot be merged."""
+        with pytest.raises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(12))
+        with pytest.raises(TypeError):
+            HyperLogLog().merge_in({1, 2, 3})
+
+    def test_round_trip_bytes(self):
+        """Test that to_bytes/from_bytes preserves the sketch."""
+        sketch = HyperLogLog(8)
+        sketch.update(range(500))
+        restored = HyperLogLog.from_bytes(sketch.to_bytes())
+        assert restored.precision == 8
+        assert restored.cardinality() == sketch.cardinality()
+
+    def test_from_bytes_rejects_bad_data(self):
+        """Test that empty or truncated data raises ValueError."""
+        with pytest.raises(ValueError):
+            HyperLogLog.from_bytes(b"")
+        with pytest.raises(ValueError):
+            HyperLogLog.from_bytes(HyperLogLog(8).to_bytes()[:-1])
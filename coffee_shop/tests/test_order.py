@@ -127,3 +127,39 @@ class TestOrderValidPriceRange:
         order = Order(customer, coffee, 5.5)
         
         assert order.price == 5.5
+
+
+class TestOrderPriceCents:
+    """Test the integer-cents price mode."""
+
+    def test_float_price_sets_cents(self):
+        """Test that a float price is also available in whole cents."""
+        order = Order(Customer("Mia"), Coffee("Mocha"), 2.35)
+        assert order.price_cents == 235
+        assert isinstance(order.price_cents, int)
+
+    def test_cents_price_sets_float(self):
+        """Test that an integer-cents price keeps the float API working."""
+        order = Order(Customer("Noah"), Coffee("Latte"), price_cents=350)
+        assert order.price_cents == 350
+        assert order.price == 3.5
+
+    def test_cents_validation(self):
+        """Test that price_cents must be an int between 100 and 1000."""
+        customer = Customer("Olga")
+        coffee = Coffee("Lungo")
+        with pytest.raises(TypeError):
+            Order(customer, coffee, price_cents=2.5)
+        with pytest.raises(ValueError):
+            Order(customer, coffee, price_cents=99)
+        with pytest.raises(ValueError):
+            Order(customer, coffee, price_cents=1001)
+
+    def test_exactly_one_price(self):
+        """Test that price and price_cents cannot be combined or both omitted."""
+        customer = Customer("Paul")
+        coffee = Coffee("Cortado")
+        with pytest.raises(TypeError):
+            Order(customer, coffee)
+        with pytest.raises(TypeError):
+            Order(customer, coffee, 2.5, price_cents=250)
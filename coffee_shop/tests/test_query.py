@@ -0,0 +1,83 @@
+import sys
+sys.path.insert(0, '..')
+
+import pytest
+from coffee import Coffee
+from customer import Customer
+from query import (AVERAGE_PRICE, DISTINCT_CUSTOMERS, METRICS, MOST_AFICIONADO,
+                   NUM_ORDERS, TOTAL_PRICE_CENTS, run_queries)
+from rollup import DAY
+from shop import Shop
+
+
+@pytest.fixture
+def shop():
+    """A shop with several customers and coffees, part of it compacted."""
+    shop = Shop()
+    alice = shop.add_customer("Alice")
+    bob = shop.add_customer("Bob")
+    latte = shop.add_coffee("Latte")
+    mocha = shop.add_coffee("Mocha")
+    shop.add_coffee("Lungo")  # never ordered
+    shop.create_order(alice, latte, 3.0, created_at=10)
+    shop.create_order(bob, latte, 4.25, created_at=20)
+    shop.create_order(bob, latte, 2.5, created_at=2 * DAY)
+    shop.create_order(alice, mocha, 5.0, created_at=2 * DAY)
+    shop.compact(DAY)
+    return shop
+
+
+class TestRunQueries:
+    """Test the single-pass batch query engine."""
+
+    def test_matches_individual_methods(self, shop):
+        """Test that every metric equals the corresponding method."""
+        results = run_queries(METRICS, shop)
+
+        for coffee in shop.coffees():
+            if not coffee.num_orders():
+                assert coffee not in results[NUM_ORDERS]
+                continue
+            assert results[NUM_ORDERS][coffee] == coffee.num_orders()
+            assert results[TOTAL_PRICE_CENTS][coffee] == coffee.total_price_cents()
+            assert results[AVERAGE_PRICE][coffee] == pytest.approx(coffee.average_price())
+            assert results[MOST_AFICIONADO][coffee] is shop.most_aficionado(coffee)
+            assert results[DISTINCT_CUSTOMERS][coffee] == len(coffee.customers())
+
+    def test_only_requested_metrics(self, shop):
+        """Test that the result only contains the requested metrics."""
+        results = run_queries([NUM_ORDERS], shop)
+        assert list(results) == [NUM_ORDERS]
+
+    def test_unknown_metric(self, shop):
+        """Test that unknown metric names are rejected."""
+        with pytest.raises(ValueError):
+            run_queries(["median_price"], shop)
+
+    def test_generator_source(self):
+        """Test that a generator of orders can be queried."""
+        coffee = Coffee("Cortado")
+        customers = [Customer("Carol"), Customer("Dave")]
+        orders = (customer.create_order(coffee, 2.0) for customer in customers)
+
+        results = run_queries([NUM_ORDERS, DISTINCT_CUSTOMERS], orders)
+        assert results[NUM_ORDERS][coffee] == 2
+        assert results[DISTINCT_CUSTOMERS][coffee] == 2
+
+    def test_snapshot_source(self, shop):
+        """Test that a snapshot is queried without later orders."""
+        view = shop.snapshot()
+        latte = shop.coffees()[0]
+        shop.create_order(shop.customers()[0], latte, 9.0)
+
+        assert run_queries([NUM_ORDERS], view)[NUM_ORDERS][latte] == 3
+        assert run_queries([NUM_ORDERS], shop)[NUM_ORDERS][latte] == 4
+
+    def test_global_source(self, monkeypatch):
+        """Test that no source means the global registry."""
+        monkeypatch.setattr(Customer, "_all_orders", [])
+        monkeypatch.setattr(Customer, "_all_rollups", {})
+        coffee = Coffee("Mocha")
+        Customer("Erin").create_order(coffee, 4.0)
+
+        assert run_queries([AVERAGE_PRICE])[AVERAGE_PRICE] == {coffee: 4.0}
@@ -0,0 +1,202 @@
+import sys
+sys.path.insert(0, '..')
+
+import threading
+
+import pytest
+from coffee import Coffee
+from customer import Customer
+from query import MOST_AFICIONADO, run_queries
+from rollup import DAY, OrderRollup, compact_orders
+from shop import Shop
+
+
+def answers(shop, coffees):
+    """Collect the aggregate answers that compaction must preserve."""
+    return {
+        coffee.name: (
+            coffee.num_orders(),
+            round(coffee.average_price(), 9),
+            coffee.total_price_cents(),
+            shop.most_aficionado(coffee),
+            set(coffee.customers()),
+        )
+        for coffee in coffees
+    }
+
+
+@pytest.fixture
+def history():
+    """A shop with orders spread over three days."""
+    shop = Shop()
+    alice = shop.add_customer("Alice")
+    bob = shop.add_customer("Bob")
+    latte = shop.add_coffee("Latte")
+    mocha = shop.add_coffee("Mocha")
+    shop.create_order(alice, latte, 3.0, created_at=0 * DAY + 10)
+    shop.create_order(alice, latte, 4.5, created_at=0 * DAY + 20)
+    shop.create_order(bob, latte, 9.0, created_at=1 * DAY + 10)
+    shop.create_order(bob, mocha, 2.0, created_at=1 * DAY + 20)
+    shop.create_order(alice, mocha, 5.0, created_at=2 * DAY + 10)
+    shop.create_order(alice, latte, 2.25, created_at=2 * DAY + 20)
+    return shop, alice, bob, latte, mocha
+
+
+class TestOrderRollup:
+    """Test the OrderRollup summary type."""
+
+    def test_merge(self, history):
+        """Test that merging rollups adds counts and spend and keeps min/max."""
+        shop, alice, _, latte, _ = history
+        first, second = alice.orders()[:2]
+        merged = OrderRollup.from_order(first, 0).merge(OrderRollup.from_order(second, 0))
+
+        assert merged.count == 2
+        assert merged.spend_cents == 750
+        assert merged.min_price == 3.0
+        assert merged.max_price == 4.5
+
+
+class TestCompaction:
+    """Test compacting orders of a shop into rollups."""
+
+    def test_compaction_preserves_answers(self, history):
+        """Test that aggregates are unchanged after compaction."""
+        shop, alice, bob, latte, mocha = history
+        before = answers(shop, [latte, mocha])
+        coffees_before = {customer: set(customer.coffees()) for customer in (alice, bob)}
+
+        assert shop.compact(2 * DAY) == 4
+
+        assert answers(shop, [latte, mocha]) == before
+        assert {customer: set(customer.coffees()) for customer in (alice, bob)} == coffees_before
+
+    def test_compaction_bounds_raw_orders(self, history):
+        """Test that compacted orders are dropped from the raw lists."""
+        shop, alice, bob, latte, _ = history
+        shop.compact(2 * DAY)
+
+        assert len(shop.orders()) == 2
+        assert len(latte.orders()) == 1
+        assert bob.orders() == []
+        assert len(shop.rollups()) == 3
+
+    def test_rollups_per_period(self, history):
+        """Test that each (period, customer, coffee) gets one rollup."""
+        shop, alice, _, latte, _ = history
+        shop.compact(1 * DAY)
+
+        [rollup] = shop.rollups()
+        assert rollup.period_start == 0
+        assert rollup.customer is alice
+        assert rollup.coffee is latte
+        assert (rollup.count, rollup.spend_cents) == (2, 750)
+        assert (rollup.min_price_cents, rollup.max_price_cents) == (300, 450)
+
+    def test_repeated_compaction_merges(self, history):
+        """Test that compacting twice merges into existing rollups."""
+        shop, _, _, latte, mocha = history
+        before = answers(shop, [latte, mocha])
+        shop.create_order(shop.customers()[0], latte, 6.0, created_at=15)
+
+        shop.compact(1 * DAY)
+        shop.compact(3 * DAY)
+
+        assert shop.orders() == []
+        assert latte.num_orders() == 5
+        assert latte.total_price_cents() == before["Latte"][2] + 600
+
+    @pytest.mark.parametrize("cutoff", [15, 35, DAY])
+    def test_compaction_keeps_tie_break(self, cutoff):
+        """Test that a spending tie still goes to the customer who ordered first."""
+        shop = Shop()
+        latte = shop.add_coffee("Latte")
+        customers = [shop.add_customer(name) for name in ("Zoe", "Yan", "Xia", "Wes")]
+        for minute, customer in enumerate(customers):
+            shop.create_order(customer, latte, 3.0, created_at=10 + 10 * minute)
+        assert shop.most_aficionado(latte) is customers[0]
+
+        shop.compact(cutoff)
+
+        assert shop.most_aficionado(latte) is customers[0]
+        assert shop.snapshot().most_aficionado(latte) is customers[0]
+        assert run_queries([MOST_AFICIONADO], shop)[MOST_AFICIONADO][latte] is customers[0]
+
+    def test_reads_consistent_during_compaction(self):
+        """Test that aggregates never mix the lists from before and after a compaction."""
+        shop = Shop()
+        alice = shop.add_customer("Alice")
+        latte = shop.add_coffee("Latte")
+        for minute in range(500):
+            shop.create_order(alice, latte, price_cents=250, created_at=60 * minute)
+        done = threading.Event()
+
+        def compactor():
+            for minute in range(500):
+                shop.compact(60 * minute + 1)
+            done.set()
+
+        # Switch threads very often so that a read can straddle a compaction
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            thread = threading.Thread(target=compactor)
+            thread.start()
+            while not done.is_set():
+                assert latte.num_orders() == 500
+                assert latte.average_price() == 2.5
+                assert latte.total_price_cents() == 125000
+            thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        assert latte.orders() == []
+
+    def test_compaction_keeps_spend_profile(self, history):
+        """Test that spend profiles are not affected by compaction."""
+        shop, alice, _, _, _ = history
+        before = alice.spend_profile()
+        shop.compact(3 * DAY)
+        assert alice.spend_profile() == before
+
+    def test_distinct_sketch_includes_rollups(self, history):
+        """Test that a sketch enabled after compaction counts compacted customers."""
+        shop, _, _, latte, _ = history
+        shop.compact(2 * DAY)
+        assert len(latte.orders()) == 1  # only Alice's recent order is raw
+
+        latte.track_distinct_customers()
+        assert latte.distinct_customers_estimate().estimate == 2
+
+    def test_compact_nothing(self, history):
+        """Test that a cutoff before all orders compacts nothing."""
+        shop = history[0]
+        assert shop.compact(0) == 0
+        assert shop.rollups() == []
+
+    def test_compact_validation(self):
+        """Test that compaction arguments are validated."""
+        with pytest.raises(TypeError):
+            compact_orders("yesterday")
+        with pytest.raises(ValueError):
+            compact_orders(0, period_seconds=0)
+
+
+class TestGlobalCompaction:
+    """Test compacting the process-wide order registry."""
+
+    def test_global_compaction(self, monkeypatch):
+        """Test that orders without a shop are compacted in Customer._all_orders."""
+        monkeypatch.setattr(Customer, "_all_orders", [])
+        monkeypatch.setattr(Customer, "_all_rollups", {})
+        customer = Customer("Carol")
+        coffee = Coffee("Cortado")
+        customer.create_order(coffee, 2.5, created_at=10)
+        recent = customer.create_order(coffee, 3.5, created_at=2 * DAY)
+
+        assert compact_orders(DAY) == 1
+
+        assert Customer._all_orders == [recent]
+        assert len(Customer._all_rollups) == 1
+        assert coffee.num_orders() == 2
+        assert coffee.average_price() == 3.0
+        assert Customer.most_aficionado(coffee) is customer
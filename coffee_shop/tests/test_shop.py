@@ -0,0 +1,164 @@
+import sys
+sys.path.insert(0, '..')
+
+import gc
+import threading
+import weakref
+
+import pytest
+from coffee import Coffee
+from customer import Customer
+from events import OrderEventStream
+from shop import Shop
+
+
+class TestShopInitialization:
+    """Test Shop creation and registration of customers and coffees."""
+
+    def test_shop_name_validation(self):
+        """Test that the shop name must be a non-empty string."""
+        with pytest.raises(TypeError):
+            Shop(123)
+        with pytest.raises(ValueError):
+            Shop("")
+
+    def test_add_customer_and_coffee(self):
+        """Test that customers and coffees are registered in the shop."""
+        shop = Shop("Downtown")
+        alice = shop.add_customer("Alice")
+        latte = shop.add_coffee("Latte")
+
+        assert shop.customers() == [alice]
+        assert shop.coffees() == [latte]
+        assert shop.orders() == []
+
+
+class TestShopOrders:
+    """Test that orders stay inside their shop."""
+
+    def test_create_order_in_shop(self):
+        """Test that shop orders are recorded in the shop, not globally."""
+        shop = Shop()
+        alice = shop.add_customer("Alice")
+        latte = shop.add_coffee("Latte")
+
+        order = shop.create_order(alice, latte, 3.0)
+
+        assert shop.orders() == [order]
+        assert alice.orders() == [order]
+        assert latte.orders() == [order]
+        assert order not in Customer._all_orders
+
+    def test_shops_are_isolated(self):
+        """Test that two shops do not see each other's orders."""
+        north = Shop("North")
+        south = Shop("South")
+        north_customer = north.add_customer("Bob")
+        south_customer = south.add_customer("Bob")
+        north_coffee = north.add_coffee("Mocha")
+        south_coffee = south.add_coffee("Mocha")
+
+        north.create_order(north_customer, north_coffee, 4.0)
+        south.create_order(south_customer, south_coffee, 2.0)
+        south.create_order(south_customer, south_coffee, 2.0)
+
+        assert len(north.orders()) == 1
+        assert len(south.orders()) == 2
+        assert north.most_aficionado(north_coffee) == north_customer
+        assert south.most_aficionado(south_coffee) == south_customer
+
+    def test_cross_shop_orders_rejected(self):
+        """Test that customers cannot order coffees from another shop."""
+        north = Shop("North")
+        south = Shop("South")
+        customer = north.add_customer("Carol")
+        coffee = south.add_coffee("Cortado")
+
+        with pytest.raises(ValueError):
+            customer.create_order(coffee, 2.5)
+        with pytest.raises(ValueError):
+            north.create_order(customer, Coffee("Lungo"), 2.5)
+        with pytest.raises(ValueError):
+            Customer("Dave").create_order(coffee, 2.5)
+        with pytest.raises(ValueError):
+            north.most_aficionado(coffee)
+
+    def test_shop_event_stream(self):
+        """Test that a shop publishes to its own event stream only."""
+        stream = OrderEventStream()
+        shop = Shop(event_stream=stream)
+        order = shop.create_order(shop.add_customer("Erin"), shop.add_coffee("Latte"), 3.0)
+
+        received = []
+        stream.subscribe(received.extend)
+        stream.drain()
+        assert [event.order for event in received] == [order]
+
+    def test_parallel_shops(self):
+        """Test that shops used from separate threads keep exact counts."""
+        shops = [Shop(f"Shop {i}") for i in range(4)]
+
+        def place_orders(shop):
+            customer = shop.add_customer("Finn")
+            coffee = shop.add_coffee("Espresso")
+            for _ in range(500):
+                shop.create_order(customer, coffee, price_cents=250)
+
+        threads = [threading.Thread(target=place_orders, args=(shop,)) for shop in shops]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [len(shop.orders()) for shop in shops] == [500] * 4
+
+
+class TestShopRelease:
+    """Test that a shop's memory can be released."""
+
+    def test_dropped_shop_is_collected(self):
+        """Test that nothing global keeps a dropped shop's orders alive."""
+        shop = Shop()
+        order = shop.create_order(shop.add_customer("Gina"), shop.add_coffee("Latte"), 3.0)
+        order_ref = weakref.ref(order)
+        del shop, order
+        gc.collect()
+        assert order_ref() is None
+
+    def test_clear(self):
+        """Test that clear() forgets all of the shop's data."""
+        shop = Shop()
+        shop.create_order(shop.add_customer("Hank"), shop.add_coffee("Latte"), 3.0)
+        shop.clear()
+        assert shop.orders() == []
+        assert shop.customers() == []
+        assert shop.coffees() == []
+
+    def test_cleared_objects_cannot_order(self):
+        """Test that customers and coffees of a cleared shop are detached."""
+        shop = Shop()
+        customer = shop.add_customer("Ivy")
+        coffee = shop.add_coffee("Latte")
+        shop.clear()
+
+        with pytest.raises(ValueError):
+            customer.create_order(coffee, 3.0)
+        with pytest.raises(ValueError):
+            shop.create_order(customer, coffee, 3.0)
+        assert shop.orders() == []
+
+        # The shop itself stays usable with new customers and coffees
+        fresh = shop.create_order(shop.add_customer("Jon"), shop.add_coffee("Mocha"), 4.0)
+        assert shop.orders() == [fresh]
+
+    def test_clear_detaches_directly_built_objects(self):
+        """Test that Customer/Coffee built with shop= are registered and detached."""
+        shop = Shop()
+        customer = Customer("Kai", shop=shop)
+        coffee = Coffee("Latte", shop=shop)
+        assert shop.customers() == [customer]
+        assert shop.coffees() == [coffee]
+
+        shop.clear()
+        with pytest.raises(ValueError):
+            customer.create_order(coffee, 3.0)
@@ -0,0 +1,119 @@
+import sys
+sys.path.insert(0, '..')
+
+import threading
+
+from coffee import Coffee
+from customer import Customer
+from rollup import DAY
+from shop import Shop
+from snapshot import snapshot
+
+
+class TestSnapshotIsolation:
+    """Test that snapshots do not see later writes."""
+
+    def test_snapshot_ignores_new_orders(self):
+        """Test that orders created after the snapshot are invisible."""
+        shop = Shop()
+        alice = shop.add_customer("Alice")
+        bob = shop.add_customer("Bob")
+        latte = shop.add_coffee("Latte")
+        shop.create_order(alice, latte, 4.0)
+
+        view = shop.snapshot()
+        shop.create_order(bob, latte, 9.0)
+        shop.create_order(bob, latte, 9.0)
+
+        assert view.num_orders(latte) == 1
+        assert view.average_price(latte) == 4.0
+        assert view.customers(latte) == [alice]
+        assert view.most_aficionado(latte) is alice
+        assert latte.num_orders() == 3  # the live coffee keeps moving
+        assert shop.most_aficionado(latte) is bob
+
+    def test_snapshot_survives_compaction(self):
+        """Test that compaction after the snapshot does not change it."""
+        shop = Shop()
+        alice = shop.add_customer("Alice")
+        latte = shop.add_coffee("Latte")
+        shop.create_order(alice, latte, 3.0, created_at=10)
+        shop.create_order(alice, latte, 5.0, created_at=2 * DAY)
+
+        view = shop.snapshot()
+        shop.compact(DAY)
+
+        assert len(view.orders()) == 2
+        assert view.rollups() == []
+        assert view.total_price_cents(latte) == 800
+        assert shop.snapshot().total_price_cents(latte) == 800
+        assert len(shop.snapshot().rollups()) == 1
+
+    def test_iter_orders_is_frozen(self):
+        """Test that iter_orders streams only the orders visible in the snapshot."""
+        shop = Shop()
+        customer = shop.add_customer("Erin")
+        latte = shop.add_coffee("Latte")
+        first = shop.create_order(customer, latte, 3.0)
+
+        view = shop.snapshot()
+        shop.create_order(customer, latte, 4.0)
+
+        assert list(view.iter_orders()) == [first]
+        assert list(view.iter_rollups()) == []
+
+    def test_unknown_coffee(self):
+        """Test queries for a coffee without orders in the snapshot."""
+        shop = Shop()
+        latte = shop.add_coffee("Latte")
+        view = shop.snapshot()
+
+        assert view.num_orders(latte) == 0
+        assert view.average_price(latte) == 0.0
+        assert view.most_aficionado(latte) is None
+        assert view.coffees() == []
+
+
+class TestSnapshotConcurrency:
+    """Test snapshots taken while writers are running."""
+
+    def test_consistent_under_concurrent_writes(self):
+        """Test that each snapshot sees a consistent prefix of the orders."""
+        shop = Shop()
+        customer = shop.add_customer("Carol")
+        latte = shop.add_coffee("Latte")
+        stop = threading.Event()
+
+        def writer():
+            while not stop.is_set():
+                shop.create_order(customer, latte, price_cents=200)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            for _ in range(50):
+                view = shop.snapshot()
+                count = view.num_orders(latte)
+                assert view.total_price_cents(latte) == 200 * count
+                assert len(view.orders()) == count
+        finally:
+            stop.set()
+            thread.join()
+
+
+class TestGlobalSnapshot:
+    """Test snapshots of the process-wide registry."""
+
+    def test_global_snapshot(self, monkeypatch):
+        """Test that snapshot() without a shop reads Customer._all_orders."""
+        monkeypatch.setattr(Customer, "_all_orders", [])
+        monkeypatch.setattr(Customer, "_all_rollups", {})
+        customer = Customer("Dave")
+        coffee = Coffee("Mocha")
+        customer.create_order(coffee, 2.0)
+
+        view = snapshot()
+        customer.create_order(coffee, 4.0)
+
+        assert view.num_orders(coffee) == 1
+        assert view.coffees() == [coffee]